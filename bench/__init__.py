@@ -0,0 +1 @@
+# Benchmarks do pipeline SDR com dados sintéticos (python -m bench.run).
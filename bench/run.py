@@ -0,0 +1,176 @@
+# Benchmark das etapas do pipeline SDR sobre dados sintéticos.
+#
+#   python -m bench.run                              # tamanho "pequeno"
+#   python -m bench.run -s medio -s grande -o bench/results/atual.json
+#   python -m bench.run -s medio --compare bench/results/anterior.json
+#
+# Cada etapa é medida (melhor de --repeat execuções) e comparada com o
+# orçamento em bench/budgets.json (custo fixo + ms por 100 mil linhas) e, se informado,
+# com um resultado anterior; o processo sai com código 1 se alguma etapa
+# estourar o orçamento ou regredir mais que --tolerance.
+import argparse
+import glob
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from bench.synthetic import generate
+from sdr.charts import grafico_temperatura_degelos
+from sdr.colstore import COLS_SUFFIX, load_columns
+from sdr.ingest import load_files
+from sdr.lod import build_pyramid
+from sdr.events import defrost_events, events_in_range
+from sdr.metrics import efficiency_table
+from sdr.parser import read_sdr_csv
+from sdr.partition import build_partition, data_range, select
+from sdr.performance import performance_table, recovery_mask
+from sdr.rollup import daily_rollup
+
+# nome -> (lojas, câmaras por loja, anos)
+TAMANHOS = {
+    "pequeno": (1, 2, 0.25),
+    "medio": (2, 5, 1),
+    "grande": (5, 10, 2),
+}
+BUDGETS = os.path.join(os.path.dirname(__file__), "budgets.json")
+
+
+def _medir(func, repeat: int) -> tuple[float, object]:
+    melhor, resultado = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        resultado = func()
+        melhor = min(melhor, time.perf_counter() - t0)
+    return melhor * 1000, resultado
+
+
+def _limpar_cache(pasta: str) -> None:
+    for caminho in glob.glob(os.path.join(pasta, "*", "*.parquet")):
+        os.remove(caminho)
+    for caminho in glob.glob(os.path.join(pasta, "*", "*" + COLS_SUFFIX)):
+        shutil.rmtree(caminho)
+
+
+def run_size(nome: str, repeat: int) -> dict:
+    lojas, camaras, anos = TAMANHOS[nome]
+    with tempfile.TemporaryDirectory(prefix="sdr_bench_") as pasta:
+        geradas = generate(pasta, lojas, camaras, anos)
+        arquivos = {(loja, cam): caminho for loja, cams in geradas.items() for cam, caminho in cams.items()}
+        etapas = {}
+
+        etapas["parse_csv"], _ = _medir(lambda: [read_sdr_csv(c) for c in arquivos.values()], repeat)
+
+        def carga_fria():
+            _limpar_cache(pasta)
+            return load_files(arquivos)
+        etapas["load_cold"], _ = _medir(carga_fria, repeat)
+        etapas["load_cached"], (frames, _) = _medir(lambda: load_files(arquivos), repeat)
+        load_files(arquivos, loader=load_columns)
+        etapas["open_mmap"], _ = _medir(lambda: load_files(arquivos, loader=load_columns), repeat)
+        linhas = sum(len(df) for df in frames.values())
+
+        # Etapas por loja (como o dashboard), somadas entre as lojas
+        soma = dict.fromkeys(["partition", "events", "rollup", "efficiency_table", "performance_table",
+                              "recovery_mask", "pyramid", "chart"], 0.0)
+        for loja, cams in geradas.items():
+            loja_frames = {cam: frames[(loja, cam)] for cam in cams}
+            ms, partes = _medir(lambda: build_partition(loja_frames), repeat)
+            soma["partition"] += ms
+            ms, eventos = _medir(lambda: {c: defrost_events(df) for c, df in loja_frames.items()}, repeat)
+            soma["events"] += ms
+            ms, rollups = _medir(lambda: {c: daily_rollup(df, eventos[c]) for c, df in loja_frames.items()}, repeat)
+            soma["rollup"] += ms
+
+            inicio, fim = (t.date() for t in data_range(partes))
+            potencias = dict.fromkeys(cams, 16.05)
+            soma["efficiency_table"] += _medir(lambda: efficiency_table(rollups, potencias, inicio, fim), repeat)[0]
+            soma["performance_table"] += _medir(
+                lambda: [performance_table(r, inicio, fim, 2.0) for r in rollups.values()], repeat)[0]
+
+            soma["recovery_mask"] += _medir(
+                lambda: [recovery_mask(s.index, eventos[c]["Inicio"]) for c, s in partes.items()], repeat)[0]
+            ms, piramides = _medir(lambda: {c: build_pyramid(s.series("Temp ambiente")) for c, s in partes.items()}, repeat)
+            soma["pyramid"] += ms
+
+            def graficos():
+                return [grafico_temperatura_degelos(select(partes, c, inicio, fim), piramides[c],
+                                                    events_in_range(eventos[c], inicio, fim), inicio, fim).to_json()
+                        for c in partes]
+            soma["chart"] += _medir(graficos, repeat)[0]
+
+        etapas.update(soma)
+
+    return {
+        "lojas": lojas, "camaras": camaras, "anos": anos, "linhas": linhas,
+        "etapas_ms": {k: round(v, 2) for k, v in etapas.items()},
+    }
+
+
+def check(resultado: dict, budgets: dict, anterior: dict | None, tolerancia: float) -> list[str]:
+    # Lista de falhas: orçamento (fixo + ms por 100 mil linhas) e regressão vs anterior
+    falhas = []
+    for tamanho, r in resultado["tamanhos"].items():
+        escala = r["linhas"] / 100_000
+        for etapa, ms in r["etapas_ms"].items():
+            orcamento = budgets.get(etapa)
+            if orcamento is not None:
+                limite = orcamento["fixo_ms"] + orcamento["ms_por_100k"] * escala
+                if ms > limite:
+                    falhas.append(f"{tamanho}/{etapa}: {ms:.1f} ms > orçamento {limite:.1f} ms")
+            if anterior is not None:
+                antes = anterior.get("tamanhos", {}).get(tamanho, {}).get("etapas_ms", {}).get(etapa)
+                if antes and ms > antes * (1 + tolerancia):
+                    falhas.append(f"{tamanho}/{etapa}: {ms:.1f} ms > {antes:.1f} ms anterior (+{tolerancia:.0%})")
+    return falhas
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark do pipeline SDR com dados sintéticos")
+    parser.add_argument("-s", "--size", action="append", choices=list(TAMANHOS),
+                        help="tamanho(s) a medir (padrão: pequeno)")
+    parser.add_argument("-r", "--repeat", type=int, default=3, help="execuções por etapa (vale a melhor)")
+    parser.add_argument("-o", "--out", help="grava o resultado em JSON")
+    parser.add_argument("--compare", help="resultado JSON anterior para detectar regressões")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="regressão tolerada vs anterior (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    resultado = {
+        "data": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "cpus": os.cpu_count(),
+        "tamanhos": {},
+    }
+    for tamanho in args.size or ["pequeno"]:
+        r = run_size(tamanho, args.repeat)
+        resultado["tamanhos"][tamanho] = r
+        print(f"{tamanho}: {r['lojas']} loja(s) × {r['camaras']} câmara(s) × {r['anos']} ano(s) = {r['linhas']} linhas")
+        for etapa, ms in r["etapas_ms"].items():
+            print(f"  {etapa:<18} {ms:10.1f} ms")
+
+    if args.out:
+        os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(resultado, f, ensure_ascii=False, indent=2)
+
+    with open(BUDGETS, encoding="utf-8") as f:
+        budgets = json.load(f)
+    anterior = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            anterior = json.load(f)
+    falhas = check(resultado, budgets, anterior, args.tolerance)
+    for falha in falhas:
+        print(f"FALHA {falha}", file=sys.stderr)
+    return 1 if falhas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
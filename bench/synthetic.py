@@ -0,0 +1,90 @@
+# Gerador de dados sintéticos no formato dos exports dos controladores SDR:
+# separador ";", vírgula decimal, "---" nas falhas, coluna vazia no final e
+# amostras de 5 min com 4–6 degelos por dia. Gera também o loja.json de cada
+# loja, então o diretório pode ser usado como data/ do dashboard.
+import json
+import os
+import numpy as np
+import pandas as pd
+from sdr.parser import write_sdr_csv
+
+PASSO_MIN = 5
+AMOSTRAS_DIA = 24 * 60 // PASSO_MIN
+COLUNAS = ["Temp ambiente", "Comp", "Degelo", "Temp evap", "SH", "Temp succao"]
+
+
+def chamber_frame(inicio: str, dias: int, seed: int, setpoint: float = -20.0) -> pd.DataFrame:
+    # Série de uma câmara: temperatura em torno do setpoint, degelos de 30–45 min
+    # com subida até ~-5 °C e recuperação exponencial, e algumas falhas "---"
+    rng = np.random.default_rng(seed)
+    n = dias * AMOSTRAS_DIA
+    datas = pd.date_range(inicio, periods=n, freq=f"{PASSO_MIN}min")
+
+    # Degelos: 4–6 por dia em horários sorteados
+    por_dia = rng.integers(4, 7, dias)
+    dia_evento = np.repeat(np.arange(dias), por_dia)
+    inicios = np.unique(dia_evento * AMOSTRAS_DIA + rng.integers(0, AMOSTRAS_DIA, len(dia_evento)))
+    duracoes = rng.integers(6, 10, len(inicios))
+
+    marca = np.zeros(n + 1, dtype=np.int64)
+    np.add.at(marca, inicios, 1)
+    np.add.at(marca, np.minimum(inicios + duracoes, n), -1)
+    degelo = np.cumsum(marca[:-1]) > 0
+
+    # Tempo desde o último início de degelo e duração desse degelo
+    evento = np.zeros(n, dtype=np.int64)
+    evento[inicios] = 1
+    evento = np.cumsum(evento) - 1
+    ultimo = np.where(evento >= 0, inicios[np.maximum(evento, 0)], -10**9)
+    desde = np.arange(n) - ultimo
+    dur = np.where(evento >= 0, duracoes[np.maximum(evento, 0)], 1)
+    subida = np.where(degelo, 15.0 * desde / dur, 15.0 * np.exp(-(desde - dur) / 3.0))
+    subida[evento < 0] = 0.0
+
+    temp = setpoint + rng.normal(0, 0.4, n) + subida
+    comp = (~degelo) & (rng.random(n) > 0.15)
+    evap = np.where(comp, temp - 10 + rng.normal(0, 0.3, n), temp - 2)
+    df = pd.DataFrame({
+        "Temp ambiente": temp.round(1),
+        "Comp": pd.array(comp.astype(np.int8), dtype="Int8"),
+        "Degelo": pd.array(degelo.astype(np.int8), dtype="Int8"),
+        "Temp evap": evap.round(1),
+        "SH": (temp - evap).round(1),
+        "Temp succao": (temp + rng.normal(0, 0.2, n)).round(1),
+    }, index=pd.Index(datas, name="Data"))
+
+    # Falhas de comunicação: ~1 por semana, de 5 min a 2 h
+    n_falhas = max(1, dias // 7)
+    ini_falha = rng.integers(0, n, n_falhas)
+    fim_falha = np.minimum(ini_falha + rng.integers(1, 25, n_falhas), n)
+    for a, b in zip(ini_falha, fim_falha):
+        df.iloc[a:b] = pd.NA
+    return df
+
+
+def write_csv(df: pd.DataFrame, caminho: str) -> None:
+    # Grava no formato do controlador (inclusive a coluna vazia no final)
+    write_sdr_csv(df, caminho)
+
+
+def generate(destino: str, lojas: int, camaras: int, anos: float,
+             inicio: str = "2024-01-01", seed: int = 0) -> dict:
+    # Gera `lojas` × `camaras` arquivos cobrindo `anos` anos em destino/<loja>/.
+    # Retorna {loja: {camara: caminho}}.
+    dias = max(1, int(round(anos * 365)))
+    geradas = {}
+    for i in range(lojas):
+        pasta = os.path.join(destino, f"loja_sintetica_{i + 1:02d}")
+        os.makedirs(pasta, exist_ok=True)
+        nome_loja = f"Loja Sintética {i + 1:02d}"
+        cadastro = {"nome": nome_loja, "camaras": []}
+        geradas[nome_loja] = {}
+        for j in range(camaras):
+            arquivo = f"L{j + 1}.csv"
+            nome = f"Cam Cong L{j + 1}"
+            write_csv(chamber_frame(inicio, dias, seed * 10_000 + i * 100 + j), os.path.join(pasta, arquivo))
+            cadastro["camaras"].append({"nome": nome, "arquivo": arquivo, "potencia_kw": 16.05})
+            geradas[nome_loja][nome] = os.path.join(pasta, arquivo)
+        with open(os.path.join(pasta, "loja.json"), "w", encoding="utf-8") as f:
+            json.dump(cadastro, f, ensure_ascii=False, indent=4)
+    return geradas
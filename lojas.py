@@ -1,28 +1,36 @@
-def lojas_selecionadas(loja:str): # Função para seleção dos arquivos das lojas
+from sdr.registry import load_registry, registry_signature
+from sdr.schedule import HORARIO_PADRAO
+
+# Último cadastro lido: (assinatura dos loja.json, (lojas, erros))
+_CADASTRO = (None, None)
+
+def cadastro(): # (lojas, erros) de data/<loja>/loja.json; só relê quando algum loja.json muda
+    global _CADASTRO
+    assinatura = registry_signature()
+    ultima, dados = _CADASTRO
+    if dados is None or ultima != assinatura:
+        dados = load_registry()
+        _CADASTRO = (assinatura, dados)
+    return dados
+
+def lojas_disponiveis(lojas=None): # Lista das lojas cadastradas em data/<loja>/loja.json
+    return list(cadastro()[0] if lojas is None else lojas)
+
+def erros_cadastro(): # loja.json que não puderam ser lidos: caminho -> erro
+    return cadastro()[1]
+
+def lojas_selecionadas(loja:str, lojas=None): # Função para seleção dos arquivos das lojas
 # POTENCIAS: Potencias em kW das resistências de degelo   
 # ARQUIVOS: Caminhos e nomes dos arquivos com os dados
-    match loja:
-        case "Atacadão Bangu RJ":
-            ARQUIVOS = {
-                "Cam Cong L1": r"data/atacadao_bangu_RJ/L1.csv",
-                "Cam Cong L2": r"data/atacadao_bangu_RJ/L2.csv",
-                    }
-            POTENCIAS = {
-                "Cam Cong L1": 16.05,
-                "Cam Cong L2": 16.05,
-                    }
-        case "Atacadão Palmas TO":
-            ARQUIVOS = {
-                "Cam Cong L1": r"data/atacadao_palmas_TO/L1.csv",
-                "Cam Cong L2": r"data/atacadao_palmas_TO/L2.csv",
-                "Cam Cong L3": r"data/atacadao_palmas_TO/L3.csv",
-                    }
-            POTENCIAS = {
-                "Cam Cong L1": 16.05,
-                "Cam Cong L2": 16.05,
-                "Cam Cong L3": 16.05,
-                    }   
-        case _:
-            ARQUIVOS = {None:None}
-            POTENCIAS = {None:None}
-    return ARQUIVOS, POTENCIAS
\ No newline at end of file
+# lojas: cadastro já lido nesta execução (padrão: cadastro()[0])
+    registro = cadastro_loja(loja, lojas)
+    if registro is None:
+        return {}, {}
+    return dict(registro["arquivos"]), dict(registro["potencias"])
+
+def cadastro_loja(loja:str, lojas=None): # Cadastro completo da loja (pasta, arquivos, potências) ou None
+    return (cadastro()[0] if lojas is None else lojas).get(loja)
+
+def horario_loja(loja:str, lojas=None): # Horário de funcionamento da loja (padrão 08–21h, seg–sex, se não cadastrado)
+    registro = cadastro_loja(loja, lojas)
+    return registro["horario"] if registro else HORARIO_PADRAO
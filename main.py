@@ -1,28 +1,63 @@
 import streamlit as st
+import streamlit.components.v1 as components
 import pandas as pd
-import altair as alt
+import json
 from datetime import timedelta
 import os
-from lojas import lojas_selecionadas
+import multiprocessing
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from lojas import cadastro, cadastro_loja, horario_loja, lojas_disponiveis, lojas_selecionadas
+from sdr.analysis import analyze_chambers
+from sdr.charts import barras_prev_real, grafico_tolerancia
+from sdr.live import LiveSeries, live_store_data
+from sdr.memcache import FileCache
+from sdr.metrics import CYCLES_DAY, CYCLE_HOURS, efficiency_table, efficiency_total
+from sdr.performance import performance_table, tolerance_curve
+from sdr.schedule import period_names
+from sdr.snapshot import PERIODOS_PADRAO, ensure_snapshots
+from sdr.store import load_store, memory_report, store_signature
+from sdr.timing import StageTimer, cache_delta
 
 # Incializa o dashboard com os dicionários em nulo, aguardando serem selecionados pelo usuário
 ARQUIVOS = {None: None}
 POTENCIAS = {None: None}
 
-# ─── Paleta Plotter Racks ────────────────────────────────────────────────────
-COLOR_PREV = "#112D4E"
-COLOR_REAL = "#3F72AF"
-COLOR_ECON = "#1177FC"
-COLOR_BG   = "#E8E8E8"
-
 # Titulo da caixa de seleção da instalação
 st.sidebar.header("Seleção da instalação", help='Selecione a instalação que deseja analisar')
 
-# Opções disponiveis: 'Eficinência Energética' + lista com as chaves do dicionário de arquivos existentes
-options = ["Atacadão Palmas TO","Atacadão Bangu RJ"]
+# Opções disponiveis: lojas cadastradas em data/<loja>/loja.json, lidas uma
+# vez por execução (e relidas só quando algum loja.json muda)
+LOJAS, ERROS_CADASTRO = cadastro()
+options = lojas_disponiveis(LOJAS)
+# Cadastro inválido: a loja fica fora da lista, as outras seguem
+for caminho, e in ERROS_CADASTRO.items():
+    st.warning(f"Cadastro ignorado ({caminho}): {e}")
+if not options:
+    st.error("Nenhuma loja cadastrada. Verifique os arquivos data/<loja>/loja.json.")
+    st.stop()
 selecionado = st.sidebar.selectbox("Selecione a instalação:", options, index=0)
 
-ARQUIVOS, POTENCIAS = lojas_selecionadas(str(selecionado))
+ARQUIVOS, POTENCIAS = lojas_selecionadas(str(selecionado), LOJAS)
+HORARIO = horario_loja(str(selecionado), LOJAS)
+# Janela de recuperação pós-degelo excluída da performance de temperatura
+RECOVERY_START = timedelta(minutes=45)
+RECOVERY_END   = timedelta(minutes=75)
+RECUPERACAO = (RECOVERY_START, RECOVERY_END)
+
+# Tempo de cada etapa desta execução: painel "Depuração" e log JSON lines (ver sdr.timing)
+TEMPOS = StageTimer({"sessao": st.session_state.setdefault("sessao_id", uuid.uuid4().hex[:8]),
+                     "loja": str(selecionado)})
+# True enquanto a página inteira roda; depois, só fragmentos rodam sozinhos
+RODANDO_PAGINA = True
+
+def desenhar_grafico(grafico, etapa="grafico", tempos=None, **extra):
+    # Gráfico Altair (ou spec Vega-Lite já em dict) com o tempo de montagem +
+    # envio e o tamanho do JSON mandado ao navegador
+    with (tempos or TEMPOS).stage(etapa, **extra) as info:
+        spec = grafico if isinstance(grafico, dict) else grafico.to_dict()
+        info["bytes"] = len(json.dumps(spec, default=str))
+        st.vega_lite_chart(spec, use_container_width=True)
 
 # ─── Configuração da Página ──────────────────────────────────────────────────
 st.set_page_config(
@@ -36,62 +71,150 @@ st.header(f"Plotter Racks - Análise SDR -{selecionado} :snowflake: :heavy_dolla
 
 # Verificar quais arquivos existem
 ARQUIVOS_EXISTENTES = {}
-for nome, caminho in ARQUIVOS.items():
-    if os.path.exists(caminho):
-        ARQUIVOS_EXISTENTES[nome] = caminho
-    else:
-        st.warning(f"Arquivo não encontrado: {caminho}")
+with TEMPOS.stage("arquivos", camaras=len(ARQUIVOS)):
+    for nome, caminho in ARQUIVOS.items():
+        if os.path.exists(caminho):
+            ARQUIVOS_EXISTENTES[nome] = caminho
+        else:
+            st.warning(f"Arquivo não encontrado: {caminho}")
 
 if not ARQUIVOS_EXISTENTES:
     st.error("Nenhum arquivo de dados encontrado. Verifique os caminhos dos arquivos.")
     st.stop()
 
-CYCLES_DAY  = 4
-CYCLE_HOURS = 45 / 60
-SETPOINT    = -20.0
+# ─── Relatórios prontos ──────────────────────────────────────────────────────
+# Visões padrão em HTML estático: abrem sem carregar nem processar os dados
+st.sidebar.header("Relatórios prontos", help='Última semana / último mês, gerados só quando os dados mudam')
+rotulos = {"—": None} | {rotulo: chave for chave, (rotulo, _) in PERIODOS_PADRAO.items()}
+relatorio = st.sidebar.selectbox("Abrir relatório:", list(rotulos), index=0)
+if rotulos[relatorio] is not None:
+    with TEMPOS.stage("snapshot", relatorio=rotulos[relatorio]):
+        caminhos = ensure_snapshots(cadastro_loja(str(selecionado), LOJAS), recuperacao=RECUPERACAO)
+    if rotulos[relatorio] not in caminhos:
+        st.error("Não foi possível gerar o relatório desta instalação.")
+        st.stop()
+    with open(caminhos[rotulos[relatorio]], encoding="utf-8") as f:
+        pagina = f.read()
+    st.download_button("Baixar relatório (HTML)", pagina, file_name=f"SDR - {selecionado} - {relatorio}.html",
+                       mime="text/html")
+    components.html(pagina, height=900 + 900 * len(ARQUIVOS_EXISTENTES), scrolling=True)
+    st.stop()
+
+
+@st.cache_resource
+def file_cache():
+    # Cache em memória compartilhado entre as sessões, por arquivo (tamanho + mtime)
+    return FileCache()
+
+@st.cache_resource
+def analysis_pool():
+    # Pool de processos compartilhado para a análise por câmara (o trabalho é
+    # Python puro e não paraleliza em threads). "spawn": o servidor tem threads
+    # e fork poderia herdar locks presos. Com um núcleo só, roda na sessão.
+    nucleos = os.cpu_count() or 1
+    if nucleos < 2:
+        return None
+    return ProcessPoolExecutor(max_workers=nucleos, mp_context=multiprocessing.get_context("spawn"))
 
-@st.cache_data
 def load_all(paths):
-    dfs = []
+    # Lê as câmaras em paralelo; só arquivos novos ou alterados são lidos de novo
+    dados, erros = load_store(paths, file_cache(), HORARIO, RECUPERACAO)
+    for nome, e in erros.items():
+        if isinstance(e, ValueError):
+            st.warning(f"{e}: {nome}")
+        else:
+            st.error(f"Erro ao carregar {nome}: {str(e)}")
+    if dados is None:
+        st.error("Nenhum arquivo foi carregado com sucesso.")
+        st.stop()
+    return dados
+
+# ─── Modo ao vivo ────────────────────────────────────────────────────────────
+@st.cache_resource
+def live_store():
+    # Séries ao vivo compartilhadas entre as sessões (uma por arquivo)
+    return {}
+
+def load_live(paths):
+    store = live_store()
+    series = {}
     for nome, caminho in paths.items():
+        serie = store.setdefault(caminho, LiveSeries(caminho))
         try:
-            df = pd.read_csv(caminho, sep=";", encoding="utf-8", na_values='---')
-            # Verificar se o DataFrame não está vazio
-            if df.empty:
-                st.warning(f"Arquivo vazio: {nome}")
-                continue             
-            # Encontrar coluna de data/hora
-            dtcol = None
-            for c in df.columns:
-                if "Data" in str(c) or "Hora" in str(c):
-                    dtcol = c
-                    break            
-            if dtcol is None:
-                st.warning(f"Coluna de data/hora não encontrada em: {nome}")
-                continue                
-            df = df.rename(columns={dtcol: "DataHora"})
-            df["DataHora"] = pd.to_datetime(df["DataHora"], dayfirst=False, errors="coerce")            
-            # Remover linhas com data inválida
-            df = df.dropna(subset=["DataHora"])            
-            if df.empty:
-                st.warning(f"Nenhuma data válida encontrada em: {nome}")
-                continue                
-            df["Origem"] = nome
-            dfs.append(df)            
+            serie.update()
+        except ValueError as e:
+            st.warning(f"{e}: {nome}")
+            continue
         except Exception as e:
             st.error(f"Erro ao carregar {nome}: {str(e)}")
-            continue    
-    if not dfs:
+            continue
+        series[nome] = serie
+    if not series:
         st.error("Nenhum arquivo foi carregado com sucesso.")
-        st.stop()        
-    return pd.concat(dfs).set_index("DataHora").sort_index()
+        st.stop()
+    # Só refaz a partição quando alguma série recebeu linhas novas (ou o horário/janela mudou)
+    versoes = (HORARIO, RECUPERACAO) + tuple((caminho, store[caminho].version) for caminho in paths.values() if caminho in store)
+    if st.session_state.get("live_versoes") != versoes:
+        st.session_state["live_versoes"] = versoes
+        st.session_state["live_dados"] = live_store_data(series, HORARIO, RECUPERACAO)
+    return st.session_state["live_dados"]
+
+def monitor_live(paths):
+    # Verifica o final dos arquivos; a página inteira só roda de novo se chegou dado
+    store = live_store()
+    novos = 0
+    for caminho in paths.values():
+        if caminho in store:
+            try:
+                novos += store[caminho].update()
+            except Exception:
+                continue
+    if novos:
+        st.rerun()
+
+ao_vivo = st.sidebar.toggle("Modo ao vivo", help="Lê apenas as linhas novas dos arquivos e atualiza a página automaticamente")
 
 # ─── Verificar se os arquivos existem ────────────────────────────────────────
 # chama a função load_all com base no dicionário 'ARQUIVOS_EXISTENTES'
-df_all = load_all(ARQUIVOS_EXISTENTES)
+if ao_vivo:
+    intervalo = st.sidebar.number_input("Atualizar a cada (s)", 5, 600, 30, 5)
+    with TEMPOS.stage("carga", modo="ao vivo", camaras=len(ARQUIVOS_EXISTENTES)):
+        dados = load_live(ARQUIVOS_EXISTENTES)
+    ASSINATURA = ("ao vivo",) + st.session_state["live_versoes"]
+    st.fragment(monitor_live, run_every=intervalo)(ARQUIVOS_EXISTENTES)
+else:
+    # Acertos/faltas do cache por arquivo nesta carga: falta = arquivo lido
+    # de novo (parse, eventos, rollup com a janela de recuperação)
+    antes = file_cache().stats()
+    # Antes da carga: arquivo alterado no meio dela não casa com a loja lida
+    ASSINATURA = store_signature(ARQUIVOS_EXISTENTES, HORARIO, RECUPERACAO)
+    with TEMPOS.stage("carga", modo="arquivos", camaras=len(ARQUIVOS_EXISTENTES)) as info:
+        dados = load_all(ARQUIVOS_EXISTENTES)
+        info.update(cache_delta(antes, file_cache().stats()))
+PARTES, ROLLUPS, EVENTOS, PIRAMIDES, PERIODO, LACUNAS, _ = dados
+
+with st.sidebar.expander("Memória"):
+    st.table(memory_report(dados))
+    if not ao_vivo:
+        estat = file_cache().stats()
+        st.caption(
+            f"Cache: {estat['entradas']} entradas · {estat['bytes'] / 2**20:.1f} de {estat['max_bytes'] / 2**20:.0f} MB  \n"
+            f"acertos {estat['hits']} · faltas {estat['misses']} · descartes {estat['evictions']}"
+        )
+
+# Painel de depuração: atualizado a cada etapa concluída, inclusive as de baixo
+if st.sidebar.toggle("Depuração", help="Tempo de cada etapa desta execução; também gravado no log de tempos"):
+    painel = st.sidebar.empty()
+
+    def mostrar_tempos(tempos):
+        with painel.container():
+            st.dataframe(tempos.table(), use_container_width=True)
+            st.caption(f"Total até aqui: {tempos.total_ms():.0f} ms · execução {tempos.execucao}")
+    TEMPOS.ao_registrar = mostrar_tempos
+    mostrar_tempos(TEMPOS)
 
 # Checa se o dicionário foi corretamente carregado
-if df_all.empty:
+if PERIODO is None:
     st.error("Nenhum dado válido encontrado.")
     st.stop()
 
@@ -106,81 +229,74 @@ if "Eficiência Energética" in selecionados:
     selecionados = ["Eficiência Energética"]
 
 # Pega as menores e maiores datas do data frame, cm base na coluna data
-mind, maxd = df_all.index.min().date(), df_all.index.max().date()
+mind, maxd = PERIODO[0].date(), PERIODO[1].date()
 
 start_date, end_date = st.sidebar.date_input("Período", [mind, maxd], min_value=mind, max_value=maxd)
-delta = st.sidebar.number_input("Delta tolerância (K)", 0.0, 10.0, 2.0, 0.1)
-
-def calc_metrics(df_sel, pot_kw, start_date, end_date):
-    df = df_sel.copy()
-    
-    # Verificar se a coluna "Degelo" existe
-    if "Degelo" not in df.columns:
-        st.warning("Coluna 'Degelo' não encontrada nos dados.")
-        return 0, 0, 0, 0, 0, 0
+# Lugar do delta e da curva na barra lateral; preenchido por painel_desempenho
+controles = st.sidebar.container()
+camaras = [c for c in selecionados if c in ROLLUPS] or list(ROLLUPS)
+
+@st.fragment
+def painel_desempenho(camaras, start_date, end_date, tabelas):
+    # Delta, curva performance × tolerância e tabelas de performance (nos
+    # lugares que a página reservou em `tabelas`). Tudo sai dos rollups: mudar
+    # o delta roda só esta função, sem refazer gráficos, recortes nem cards.
+    tempos = TEMPOS if RODANDO_PAGINA else TEMPOS.child(fragmento="desempenho")
+    delta = st.number_input("Delta tolerância (K)", 0.0, 10.0, 2.0, 0.1)
+    periodos = period_names(HORARIO)
+    # Curva das câmaras escolhidas (todas na eficiência), do histograma de desvio
+    with st.expander("Performance × tolerância"):
+        with tempos.stage("curva_tolerancia", camaras=len(camaras)):
+            curva = tolerance_curve([ROLLUPS[c] for c in camaras], start_date, end_date, periodos)
+        desenhar_grafico(grafico_tolerancia(curva, delta), "grafico_tolerancia", tempos)
+        st.caption(f"{', '.join(map(str, camaras))} · linha tracejada: {delta:.1f} K")
+    for origem, lugar in tabelas.items():
+        with tempos.stage("performance", camara=str(origem)):
+            lugar.table(performance_table(ROLLUPS[origem], start_date, end_date, delta, periodos))
+
+def chamber_analyses(origens):
+    # Gráfico e falhas de cada câmara só dependem da loja carregada, da câmara
+    # e do período: reaproveitados entre os reruns da sessão (depuração, câmara
+    # acrescentada...). Guarda só as câmaras da página atual e a assinatura da
+    # loja, não a loja: a sessão não segura dados que o cache já descartou.
+    memo = st.session_state.get("analises")
+    valido = memo is not None and ASSINATURA is not None and memo["assinatura"] == ASSINATURA
+    anteriores = memo["itens"] if valido else {}
+    chaves = {origem: (origem, start_date, end_date) for origem in origens}
+    novas = [origem for origem, chave in chaves.items() if chave not in anteriores]
+    with TEMPOS.stage("analise", camaras=len(novas), reaproveitadas=len(origens) - len(novas),
+                      pool=analysis_pool() is not None):
+        calculadas = dict(zip(novas, analyze_chambers(dados, novas, start_date, end_date, analysis_pool())))
+    for analise in calculadas.values():
+        # Etapas medidas dentro de analyze_chamber (no processo do pool, se houver)
+        for etapa, ms in analise.tempos.items():
+            TEMPOS.record(f"{etapa}_montagem", ms, camara=str(analise.origem))
+    itens = {chave: calculadas[origem] if origem in calculadas else anteriores[chave]
+             for origem, chave in chaves.items()}
+    st.session_state["analises"] = {"assinatura": ASSINATURA, "itens": itens}
+    return [itens[chaves[origem]] for origem in origens]
 
-    # troca os erros NaN por 0 (false)    
-    df["DefrostStatus"] = pd.to_numeric(df["Degelo"], errors="coerce").fillna(0)
-
-    # Checa a transição de 0 para 1 no status de degelo, para indicar que o degelo iniciou
-    df["Event"] = df["DefrostStatus"].diff() == 1
-
-    # Conta a quantidade de eventos de início de degelo
-    eventos = int(df["Event"].sum())
-
-    # Totaliza a quantidade de dias
-    dias = (end_date - start_date).days + 1
-
-    # Totaliza a quandtidade de ciclos prevista
-    ciclos = CYCLES_DAY * dias
-
-    # consumo previsto se degelo por agenda
-    cons_prev = pot_kw * CYCLE_HOURS * ciclos
-
-    # consumo real, com o degelo pelo SDR
-    cons_real = pot_kw * CYCLE_HOURS * eventos
-
-    # Economia prevista em termos absolutos (kwh) e percentuais
-    econ_kwh = cons_prev - cons_real
-    econ_pct = econ_kwh / cons_prev * 100 if cons_prev else 0 
-
-    # Retorna os dados
-    return cons_prev, cons_real, econ_kwh, econ_pct, ciclos, eventos
+if selecionados == ["Eficiência Energética"]:
+    with controles:
+        painel_desempenho(camaras, start_date, end_date, {})
+    RODANDO_PAGINA = False
 
-def barras_prev_real(dfc):
-    base = dfc.melt(id_vars="Sistema", value_vars=["Previsto","Real"],
-                    var_name="Categoria", value_name="Valor")
-    bars = alt.Chart(base).mark_bar(size=35).encode(
-        x=alt.X("Sistema:N", title=None),
-        y=alt.Y("Valor:Q", title="Energia (kWh)"),
-        color=alt.Color("Categoria:N", scale=alt.Scale(
-            domain=["Previsto","Real"], range=[COLOR_PREV, COLOR_REAL])),
-        xOffset="Categoria:N"
-    )
-    labels = alt.Chart(base).mark_text(dy=-5, fontSize=12).encode(
-        x="Sistema:N", y="Valor:Q", detail="Categoria:N",
-        text=alt.Text("Valor:Q", format=".0f")
-    )
-    return bars + labels
+    if not any("Degelo" in serie.colunas for serie in PARTES.values()):
+        st.warning("Coluna 'Degelo' não encontrada nos dados.")
 
-if selecionados == ["Eficiência Energética"]:
-    # Total
-    tot_prev = tot_real = tot_ciclos = tot_ev = 0
-    for amb, pot in POTENCIAS.items():
-        df_sel = df_all[df_all["Origem"]==amb].loc[start_date:end_date]
-        prev, real, _, _, ciclos, ev = calc_metrics(df_sel, pot, start_date, end_date)
-        tot_prev += prev
-        tot_real += real
-        tot_ciclos += ciclos
-        tot_ev += ev
-    tot_pct = (tot_prev - tot_real) / tot_prev * 100 if tot_prev else 0
+    # Métricas de todas as câmaras a partir dos resumos diários; totais somados da tabela
+    with TEMPOS.stage("eficiencia", camaras=len(ROLLUPS)):
+        tabela = efficiency_table(ROLLUPS, POTENCIAS, start_date, end_date, CYCLES_DAY, CYCLE_HOURS)
+        total = efficiency_total(tabela)
+    tot_prev, tot_real, tot_pct = total["Previsto"], total["Real"], total["Economia (%)"]
+    tot_ciclos, tot_ev = int(total["Ciclos"]), int(total["Eventos"])
 
     st.subheader("Total - Eficiência Energética")
     c1, c2 = st.columns([3,1])
     with c1:
         df_tot = pd.DataFrame([{"Sistema":"Total","Previsto":tot_prev,"Real":tot_real}])
-        st.altair_chart(barras_prev_real(df_tot).properties(height=300).configure_view(strokeOpacity=0),
-                        use_container_width=True)
+        desenhar_grafico(barras_prev_real(df_tot).properties(height=300).configure_view(strokeOpacity=0),
+                         camara="Total")
     with c2:
         st.metric("Economia (%)", f"{tot_pct:.1f}%",
                   delta=f"Prev: {tot_prev:.1f} kWh  Real: {tot_real:.1f} kWh")
@@ -190,15 +306,15 @@ if selecionados == ["Eficiência Energética"]:
     st.markdown("---")
 
     # Por Ambiente
-    for amb, pot in POTENCIAS.items():
-        #prev, real, _, pct, ciclos, ev = calc_metrics(df_all[df_all["Origem"]==amb].loc[start_date:end_date], pot)
-        prev, real, _, pct, ciclos, ev = calc_metrics(df_all[df_all["Origem"]==amb].loc[start_date:end_date], pot, start_date, end_date)
+    for amb, linha in tabela.iterrows():
+        prev, real, pct = linha["Previsto"], linha["Real"], linha["Economia (%)"]
+        ciclos, ev = int(linha["Ciclos"]), int(linha["Eventos"])
         st.subheader(amb)
         col1, col2 = st.columns([3,1])
         with col1:
             dfc = pd.DataFrame([{"Sistema":amb,"Previsto":prev,"Real":real}])
-            st.altair_chart(barras_prev_real(dfc).properties(height=250).configure_view(strokeOpacity=0),
-                            use_container_width=True)
+            desenhar_grafico(barras_prev_real(dfc).properties(height=250).configure_view(strokeOpacity=0),
+                             camara=str(amb))
         with col2:
             st.metric("Economia (%)", f"{pct:.1f}%",
                       delta=f"Prev: {prev:.1f} kWh  Real: {real:.1f} kWh")
@@ -210,97 +326,40 @@ if selecionados == ["Eficiência Energética"]:
     st.stop()
 
 # ─── Modo Análise por Ambiente ────────────────────────────────────────────────
-for origem in selecionados:
-    pot = POTENCIAS[origem]
-    df_sel = df_all[df_all["Origem"]==origem].loc[start_date:end_date]
+# Câmaras calculadas em paralelo (pool de processos); desenho na ordem selecionada.
+# As tabelas de performance ficam num lugar reservado, preenchido por painel_desempenho
+tabelas = {}
+for analise in chamber_analyses(selecionados):
+    origem = analise.origem
 
     # Verificar se há dados para este ambiente
-    if df_sel.empty:
+    if analise.vazio:
         st.warning(f"Nenhum dado encontrado para {origem} no período selecionado.")
         continue
 
     st.header(f"Análise – {origem}")
 
     # Verificar se as colunas necessárias existem
-    required_cols = ["Temp ambiente", "Degelo"]
-    missing_cols = [col for col in required_cols if col not in df_sel.columns]
-    if missing_cols:
-        st.error(f"Colunas necessárias não encontradas em {origem}: {missing_cols}")
+    if analise.faltando:
+        st.error(f"Colunas necessárias não encontradas em {origem}: {analise.faltando}")
         continue
 
     # Temperatura & Eventos de Degelo
-    df_sel["Temp ambiente"] = pd.to_numeric(
-        df_sel["Temp ambiente"], errors="coerce"
-    ).fillna(method="ffill")
-    df_sel["Degelo"] = pd.to_numeric(
-        df_sel["Degelo"], errors="coerce"
-    ).fillna(0)
-    df_sel["Event"] = df_sel["Degelo"].diff() == 1
-    events = df_sel.index[df_sel["Event"]]
-
-    # Verificar se há dados válidos para o gráfico
-    if df_sel["Temp ambiente"].isna().all():
+    if analise.grafico is None:
         st.warning(f"Nenhum dado de temperatura válido encontrado para {origem}")
     else:
-        rects = pd.DataFrame({
-            "start": events,
-            "end":   events + pd.Timedelta(minutes=15),
-            "y1":    df_sel["Temp ambiente"].min(),
-            "y2":    df_sel["Temp ambiente"].max()
-        })
-        
-        # Verificar se há eventos para mostrar
-        if not events.empty:
-            overlay = alt.Chart(rects).mark_rect(color=COLOR_ECON, opacity=0.3).encode(
-                x="start:T", x2="end:T", y="y1:Q", y2="y2:Q"
-            )
-        else:
-            overlay = None
-            
-        line = alt.Chart(df_sel.reset_index()).mark_line(interpolate="monotone").encode(
-            x="DataHora:T",
-            y=alt.Y("Temp ambiente:Q", title="Temperatura (°C)")
-        )
-        
         st.subheader("Temperatura e Eventos de Degelo")
-        if overlay is not None:
-            st.altair_chart((overlay + line).properties(height=350).interactive(),
-                            use_container_width=True)
-        else:
-            st.altair_chart(line.properties(height=350).interactive(),
-                            use_container_width=True)
-
-    # Performance de Temperatura
-    recovery = pd.Series(False, index=df_sel.index)
-    for t0 in events:
-        recovery |= (df_sel.index > t0 + timedelta(minutes=45)) & \
-                    (df_sel.index <= t0 + timedelta(minutes=75))
-
-    periods = {
-        "Operação (08–21h)": ((df_sel.index.hour >= 8) & (df_sel.index.hour < 21) & (df_sel.index.weekday < 5)),
-        "Fora (21–08h)":     (((df_sel.index.hour >= 21) | (df_sel.index.hour < 8)) & (df_sel.index.weekday < 5)),
-        "Fim de Semana":     (df_sel.index.weekday >= 5)
-    }
-    perf_list = []
-    for nome_p, mask in periods.items():
-        valid = mask & (~recovery)
-        s = df_sel.loc[valid, "Temp ambiente"]
-        
-        # Verificar se há dados válidos para este período
-        if s.empty or s.isna().all():
-            perf_list.append({
-                "Período": nome_p,
-                "Média (°C)": "N/A",
-                "Performance (%)": "N/A"
-            })
-        else:
-            perf_pct = ((s - SETPOINT).abs() <= delta).mean() * 100
-            perf_list.append({
-                "Período": nome_p,
-                "Média (°C)": round(s.mean(), 1),
-                "Performance (%)": round(perf_pct, 1)
-            })
+        desenhar_grafico(analise.grafico, camara=str(origem))
 
+    # Performance de Temperatura (resumo diário; janela pós-degelo e falhas já excluídas)
     st.subheader("Performance de Temperatura da Câmara")
-    st.table(pd.DataFrame(perf_list).set_index("Período"))
+    tabelas[origem] = st.empty()
+    if analise.falhas is not None and not analise.falhas.empty:
+        horas = (analise.falhas["Fim"] - analise.falhas["Inicio"]).sum() / pd.Timedelta(hours=1)
+        st.caption(f"{len(analise.falhas)} falha(s) de comunicação no período ({horas:.1f} h sem dados), "
+                   "fora do cálculo de performance")
     st.markdown("---")
+
+with controles:
+    painel_desempenho(camaras, start_date, end_date, tabelas)
+RODANDO_PAGINA = False
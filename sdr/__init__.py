@@ -0,0 +1,2 @@
+# Núcleo de análise SDR (Plotter Racks): leitura e processamento dos dados
+# exportados pelos controladores, sem dependência do Streamlit.
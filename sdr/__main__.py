@@ -0,0 +1,48 @@
+# Modo batch: relatório de todas as lojas sem abrir o dashboard.
+#
+#   python -m sdr --inicio 2025-08-01 --fim 2025-08-31 -o relatorio_agosto.csv
+#   python -m sdr --loja "Atacadão Bangu RJ" --delta 1.5 -o bangu.json
+import argparse
+import sys
+import time
+from datetime import date
+from sdr.registry import DATA_DIR, load_registry
+from sdr.report import fleet_summary
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m sdr", description="Relatório SDR de todas as lojas cadastradas")
+    parser.add_argument("--data-dir", default=DATA_DIR, help="pasta com data/<loja>/loja.json (padrão: data)")
+    parser.add_argument("--loja", action="append", help="limita às lojas informadas (pode repetir)")
+    parser.add_argument("--inicio", type=date.fromisoformat, help="primeiro dia (AAAA-MM-DD); padrão: início dos dados")
+    parser.add_argument("--fim", type=date.fromisoformat, help="último dia (AAAA-MM-DD); padrão: fim dos dados")
+    parser.add_argument("--delta", type=float, default=2.0, help="tolerância de temperatura em K (padrão: 2.0)")
+    parser.add_argument("--workers", type=int, help="processos em paralelo (padrão: um por CPU)")
+    parser.add_argument("-o", "--saida", help="arquivo .csv ou .json; sem ele, imprime a tabela")
+    args = parser.parse_args(argv)
+
+    registro, erros = load_registry(args.data_dir)
+    for caminho, e in erros.items():
+        print(f"Cadastro ignorado ({caminho}): {e}", file=sys.stderr)
+    if args.loja:
+        faltando = [nome for nome in args.loja if nome not in registro]
+        if faltando:
+            parser.error(f"loja(s) não cadastrada(s): {', '.join(faltando)}")
+        registro = {nome: registro[nome] for nome in args.loja}
+
+    t0 = time.perf_counter()
+    resumo = fleet_summary(registro, args.inicio, args.fim, args.delta, args.workers)
+    duracao = time.perf_counter() - t0
+
+    if args.saida is None:
+        print(resumo.to_string(index=False))
+    elif args.saida.lower().endswith(".json"):
+        resumo.to_json(args.saida, orient="records", force_ascii=False, indent=2, date_format="iso")
+    else:
+        resumo.to_csv(args.saida, sep=";", decimal=",", index=False, encoding="utf-8")
+    print(f"{len(registro)} loja(s), {len(resumo)} câmara(s) em {duracao:.2f} s", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+# Análise por câmara do modo "Análise por ambiente": recorte do período,
+# gráfico de temperatura com degelos e falhas de comunicação. Cada câmara é
+# independente das outras, então várias podem ser calculadas ao mesmo tempo
+# num pool de processos; a página só desenha os resultados, na ordem pedida.
+# A tabela de performance, que depende também do delta, fica de fora: sai dos
+# rollups em poucos ms (sdr.performance.performance_table) e é refeita sozinha
+# quando só o delta muda.
+import time
+from typing import NamedTuple
+import numpy as np
+import pandas as pd
+from sdr.charts import grafico_temperatura_degelos
+from sdr.events import events_in_range
+from sdr.grid import gaps_in_range
+from sdr.partition import ChamberSeries, select
+
+COLUNAS_NECESSARIAS = ["Temp ambiente", "Degelo"]
+
+
+class ChamberAnalysis(NamedTuple):
+    origem: str
+    vazio: bool                       # nenhuma amostra no período
+    faltando: list                    # colunas necessárias ausentes
+    grafico: dict | None              # spec Vega-Lite; None sem temperatura válida
+    falhas: pd.DataFrame | None       # falhas não preenchidas no período (ver sdr.grid)
+    tempos: dict                      # etapa -> ms gastos aqui (montagem do gráfico)
+
+
+def analyze_chamber(origem: str, serie: ChamberSeries, piramide: dict | None, eventos: pd.DataFrame,
+                    falhas: pd.DataFrame | None, start_date, end_date) -> ChamberAnalysis:
+    # serie e eventos já recortados no período (views, ver sdr.partition). O
+    # gráfico sai como dict (to_dict é a parte cara da montagem e roda aqui,
+    # fora da página).
+    if serie.empty:
+        return ChamberAnalysis(origem, True, [], None, None, {})
+    faltando = [c for c in COLUNAS_NECESSARIAS if c not in serie.colunas]
+    if faltando:
+        return ChamberAnalysis(origem, False, faltando, None, None, {})
+
+    # Falhas curtas já vêm preenchidas da ingestão (sdr.grid); as longas
+    # aparecem como interrupções na linha
+    t0 = time.perf_counter()
+    grafico = None
+    if not np.isnan(serie.colunas["Temp ambiente"]).all():
+        grafico = grafico_temperatura_degelos(serie, piramide, eventos, start_date, end_date).to_dict()
+    tempos = {"grafico": (time.perf_counter() - t0) * 1000}
+    if falhas is not None:
+        falhas = falhas[~falhas["Preenchida"]]
+    return ChamberAnalysis(origem, False, [], grafico, falhas, tempos)
+
+
+def analyze_chambers(dados, origens: list, start_date, end_date, pool=None) -> list:
+    # dados: StoreData. Com `pool` (concurrent.futures), as câmaras são
+    # calculadas em paralelo; o resultado mantém a ordem de `origens`.
+    tarefas = [
+        (origem, select(dados.partes, origem, start_date, end_date), dados.piramides.get(origem),
+         events_in_range(dados.eventos[origem], start_date, end_date) if origem in dados.eventos
+         else pd.DataFrame(),
+         gaps_in_range(dados.lacunas[origem], start_date, end_date) if origem in dados.lacunas else None,
+         start_date, end_date)
+        for origem in origens
+    ]
+    if pool is None or len(tarefas) < 2:
+        return [analyze_chamber(*t) for t in tarefas]
+    futuros = [pool.submit(analyze_chamber, *t) for t in tarefas]
+    return [f.result() for f in futuros]
@@ -0,0 +1,96 @@
+# Gráficos Altair do relatório SDR (sem dependência do Streamlit).
+import altair as alt
+import numpy as np
+import pandas as pd
+from sdr.lod import choose_level
+from sdr.partition import slice_days
+
+# ─── Paleta Plotter Racks ────────────────────────────────────────────────────
+COLOR_PREV = "#112D4E"
+COLOR_REAL = "#3F72AF"
+COLOR_ECON = "#1177FC"
+COLOR_BG   = "#E8E8E8"
+
+
+def barras_prev_real(dfc):
+    base = dfc.melt(id_vars="Sistema", value_vars=["Previsto","Real"],
+                    var_name="Categoria", value_name="Valor")
+    bars = alt.Chart(base).mark_bar(size=35).encode(
+        x=alt.X("Sistema:N", title=None),
+        y=alt.Y("Valor:Q", title="Energia (kWh)"),
+        color=alt.Color("Categoria:N", scale=alt.Scale(
+            domain=["Previsto","Real"], range=[COLOR_PREV, COLOR_REAL])),
+        xOffset="Categoria:N"
+    )
+    labels = alt.Chart(base).mark_text(dy=-5, fontSize=12).encode(
+        x="Sistema:N", y="Valor:Q", detail="Categoria:N",
+        text=alt.Text("Valor:Q", format=".0f")
+    )
+    return bars + labels
+
+
+def _para_grafico(df: pd.DataFrame) -> pd.DataFrame:
+    # Medidas guardadas em float32 (ver sdr.parser) viram float64 arredondado,
+    # para o JSON do gráfico levar "-20.2" e não "-20.200000762939453"
+    colunas = df.select_dtypes("float32").columns
+    return df.astype({c: "float64" for c in colunas}).round({c: 2 for c in colunas})
+
+
+def grafico_temperatura(serie, piramide, start_date, end_date):
+    # serie: ChamberSeries recortada no período (ver sdr.partition). Escolhe o
+    # nível da pirâmide que dá ~1 ponto por pixel no período; faixa min–max
+    # preserva os picos de degelo e a linha mostra a média do intervalo
+    nivel = choose_level(start_date, end_date) if piramide else None
+    if nivel is None:
+        return alt.Chart(_para_grafico(serie.frame(["Temp ambiente"]).reset_index())).mark_line(interpolate="monotone").encode(
+            x="DataHora:T",
+            y=alt.Y("Temp ambiente:Q", title="Temperatura (°C)")
+        )
+    dados = _para_grafico(slice_days(piramide[nivel], start_date, end_date).reset_index())
+    faixa = alt.Chart(dados).mark_area(color=COLOR_REAL, opacity=0.35).encode(
+        x="DataHora:T",
+        y=alt.Y("Min:Q", title="Temperatura (°C)"),
+        y2="Max:Q"
+    )
+    media = alt.Chart(dados).mark_line(color=COLOR_PREV).encode(
+        x="DataHora:T",
+        y="Media:Q"
+    )
+    return faixa + media
+
+
+def grafico_temperatura_degelos(serie, piramide, eventos, start_date, end_date):
+    # Temperatura da câmara com os degelos (início ao fim medido) destacados;
+    # eventos: linhas do índice de degelos no período (ver sdr.events)
+    line = grafico_temperatura(serie, piramide, start_date, end_date)
+    if eventos.empty:
+        return line.properties(height=350).interactive()
+    temp = serie.colunas["Temp ambiente"]
+    rects = pd.DataFrame({
+        "start": eventos["Inicio"],
+        "end":   eventos["Fim"],
+        "y1":    round(float(np.nanmin(temp)), 2),
+        "y2":    round(float(np.nanmax(temp)), 2)
+    })
+    overlay = alt.Chart(rects).mark_rect(color=COLOR_ECON, opacity=0.3).encode(
+        x="start:T", x2="end:T", y="y1:Q", y2="y2:Q"
+    )
+    return (overlay + line).properties(height=350).interactive()
+
+
+def grafico_tolerancia(curva, delta):
+    # Performance × tolerância por período (saída de tolerance_curve), com a
+    # tolerância escolhida marcada
+    dados = curva.round(1).reset_index().melt(id_vars="Tolerância (K)", var_name="Período",
+                                              value_name="Performance (%)").dropna()
+    linhas = alt.Chart(dados).mark_line().encode(
+        x=alt.X("Tolerância (K):Q"),
+        y=alt.Y("Performance (%):Q", scale=alt.Scale(domain=[0, 100])),
+        color=alt.Color("Período:N", scale=alt.Scale(range=[COLOR_PREV, COLOR_REAL, COLOR_ECON]),
+                        legend=alt.Legend(orient="bottom", direction="vertical", title=None)),
+        tooltip=["Período:N", "Tolerância (K):Q", "Performance (%):Q"]
+    )
+    marca = alt.Chart(pd.DataFrame({"delta": [delta]})).mark_rule(color="gray", strokeDash=[4, 3]).encode(
+        x="delta:Q"
+    )
+    return (linhas + marca).properties(height=220)
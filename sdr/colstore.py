@@ -0,0 +1,161 @@
+# Armazenamento binário por coluna, aberto com memory mapping.
+# Cada CSV ganha um diretório ao lado (data/loja/L1.csv.cols/) com um arquivo .npy
+# de tipo fixo por coluna, mais os instantes em int64 (ns) já ordenados. Os
+# arquivos são abertos com np.load(mmap_mode="r"): abrir é instantâneo e todas
+# as sessões e processos que leem a mesma câmara compartilham as mesmas páginas
+# do cache do sistema operacional, sem cópia para a memória de cada processo.
+import json
+import os
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+from sdr.ingest import FORMAT_VERSION, load_file
+
+# Versão do layout do diretório: incrementar quando a gravação mudar
+COLS_VERSION = "1"
+COLS_SUFFIX = ".cols"
+META_NAME = "meta.json"
+TEMPO_NAME = "DataHora.npy"
+# Tentativas de abrir (ou regravar) o diretório antes de cair no frame em memória
+TENTATIVAS = 3
+
+
+def colstore_path(caminho: str) -> str:
+    # data/loja/L1.csv -> data/loja/L1.csv.cols (extensão mantida, como em
+    # sdr.ingest.cache_path)
+    return caminho + COLS_SUFFIX
+
+
+def _assinatura(caminho: str) -> dict:
+    # Mesmo critério do cache Parquet: tamanho + mtime do CSV + versões
+    info = os.stat(caminho)
+    return {
+        "size": info.st_size,
+        "mtime_ns": info.st_mtime_ns,
+        "version": f"{FORMAT_VERSION}/{COLS_VERSION}",
+    }
+
+
+def _ler_meta(destino: str) -> dict | None:
+    try:
+        with open(os.path.join(destino, META_NAME), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_columns(df: pd.DataFrame, caminho: str, destino: str) -> None:
+    # df: frame de load_file (coluna "DataHora"). Grava ordenado por tempo em
+    # diretório temporário e troca de uma vez, para ninguém mapear arquivo pela metade
+    df = df.sort_values("DataHora", kind="stable")
+    # Diretório temporário único: as sessões do Streamlit são threads do mesmo processo
+    tmp = tempfile.mkdtemp(prefix=f"{os.path.basename(destino)}.", suffix=".tmp",
+                           dir=os.path.dirname(os.path.abspath(destino)))
+    assinatura = _assinatura(caminho)
+    try:
+        _gravar_colunas(df, assinatura, tmp)
+    except Exception:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+    _trocar(tmp, destino, assinatura)
+
+
+def _gravar_colunas(df: pd.DataFrame, assinatura: dict, tmp: str) -> None:
+    np.save(os.path.join(tmp, TEMPO_NAME), df["DataHora"].to_numpy("datetime64[ns]").view(np.int64))
+    colunas = {}
+    for i, nome in enumerate(c for c in df.columns if c != "DataHora"):
+        serie = df[nome]
+        arquivo = f"c{i}"
+        if isinstance(serie.dtype, pd.api.extensions.ExtensionDtype):
+            # Inteiros com ausente (Int8): valores + máscara de ausentes
+            np.save(os.path.join(tmp, f"{arquivo}.npy"), serie.array.to_numpy(serie.dtype.numpy_dtype, na_value=0))
+            np.save(os.path.join(tmp, f"{arquivo}.mask.npy"), serie.array.isna())
+            colunas[nome] = {"arquivo": arquivo, "dtype": str(serie.dtype), "mascara": True}
+        else:
+            np.save(os.path.join(tmp, f"{arquivo}.npy"), serie.to_numpy())
+            colunas[nome] = {"arquivo": arquivo, "dtype": str(serie.dtype), "mascara": False}
+    meta = {"assinatura": assinatura, "linhas": len(df), "colunas": colunas}
+    with open(os.path.join(tmp, META_NAME), "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False)
+
+
+def _trocar(tmp: str, destino: str, assinatura: dict) -> None:
+    # Põe o diretório antigo de lado e o novo no lugar (dois renames, sem
+    # apagar antes). Quem já mapeou a versão antiga continua lendo dela até
+    # fechar. Se outro gravador pôs a mesma versão no lugar entre os dois
+    # renames, está feito; se pôs outra, tenta de novo.
+    try:
+        for _ in range(TENTATIVAS):
+            velho = f"{tmp}.old"
+            try:
+                os.rename(destino, velho)
+            except FileNotFoundError:
+                velho = None
+            try:
+                os.rename(tmp, destino)
+                return
+            except OSError:
+                meta = _ler_meta(destino)
+                if meta is not None and meta["assinatura"] == assinatura:
+                    return
+            finally:
+                if velho is not None:
+                    shutil.rmtree(velho, ignore_errors=True)
+        raise OSError(f"Armazenamento colunar trocado por outro gravador: {destino}")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def open_columns(destino: str, colunas: list | None = None) -> pd.DataFrame:
+    # DataFrame indexado por DataHora cujas colunas são views somente leitura
+    # dos arquivos mapeados (sem cópia); colunas=None abre todas
+    meta = _ler_meta(destino)
+    if meta is None:
+        raise OSError(f"Armazenamento colunar inválido: {destino}")
+
+    def mapear(arquivo):
+        return np.load(os.path.join(destino, arquivo), mmap_mode="r")
+
+    tempo = mapear(TEMPO_NAME)
+    indice = pd.DatetimeIndex(tempo.view("datetime64[ns]"), name="DataHora", copy=False)
+    dados = {}
+    for nome, info in meta["colunas"].items():
+        if colunas is not None and nome not in colunas:
+            continue
+        valores = mapear(f"{info['arquivo']}.npy")
+        if info["mascara"]:
+            valores = pd.arrays.IntegerArray(valores, mapear(f"{info['arquivo']}.mask.npy"), copy=False)
+        dados[nome] = pd.Series(valores, index=indice, copy=False)
+    df = pd.DataFrame(dados, index=indice, copy=False)
+    df.attrs["mmap"] = True
+    return df
+
+
+def load_columns(caminho: str, colunas: list | None = None) -> pd.DataFrame:
+    # Abre o armazenamento colunar do CSV, (re)gravando-o a partir do cache
+    # Parquet quando o CSV mudou. Sem permissão de escrita, devolve o frame
+    # em memória no mesmo formato (indexado por DataHora).
+    destino = colstore_path(caminho)
+    df = None
+    for _ in range(TENTATIVAS):
+        meta = _ler_meta(destino)
+        if meta is None or meta["assinatura"] != _assinatura(caminho):
+            if df is None:
+                df = load_file(caminho)
+            try:
+                write_columns(df, caminho, destino)
+            except OSError:
+                # Sem permissão, ou outro gravador pôs outra versão no lugar
+                continue
+        try:
+            return open_columns(destino, colunas)
+        except OSError:
+            # Outro gravador trocou o diretório entre o meta e os arquivos
+            continue
+    return _em_memoria(load_file(caminho) if df is None else df, colunas)
+
+
+def _em_memoria(df: pd.DataFrame, colunas: list | None) -> pd.DataFrame:
+    df = df.sort_values("DataHora", kind="stable").set_index("DataHora")
+    return df if colunas is None else df[[c for c in colunas if c in df.columns]]
@@ -0,0 +1,77 @@
+# Índice de eventos de degelo de cada câmara: uma linha por degelo com início,
+# fim, duração medida, pico de temperatura e número de amostras. Calculado uma
+# vez por arquivo (run-length encoding do status "Degelo") e persistido ao
+# lado do CSV; métricas, gráfico e janela de recuperação partem dele.
+import numpy as np
+import pandas as pd
+from sdr.ingest import cached_frame, load_file
+
+EVENTS_SUFFIX = ".events.parquet"
+EVENTS_VERSION = "2"
+COLUNAS = ["Inicio", "Fim", "Duracao_min", "Pico", "Amostras"]
+
+
+def sample_step(ts: np.ndarray) -> float:
+    # Intervalo típico entre amostras, em minutos (5 min nos controladores)
+    if len(ts) < 2:
+        return 5.0
+    return float(np.median(np.diff(ts.astype("datetime64[s]")).astype(np.int64)) / 60)
+
+
+def defrost_events(df: pd.DataFrame) -> pd.DataFrame:
+    # df: frame de uma câmara com coluna "DataHora" (saída de load_file).
+    # Um degelo é uma sequência de amostras com Degelo == 1 precedida de 0; a
+    # sequência que já começa no primeiro registro não tem início conhecido e
+    # fica de fora, como na contagem por transição 0 -> 1. Falhas longas (NaN
+    # que sobraram na grade) mantêm o último estado lido: falha no meio de um
+    # degelo não cria um segundo início, e o degelo termina na última amostra
+    # lida em degelo.
+    if "Degelo" not in df.columns or df.empty:
+        return pd.DataFrame({c: pd.Series(dtype=t) for c, t in
+                             zip(COLUNAS, ["datetime64[ns]", "datetime64[ns]", "float64", "float64", "int64"])})
+    ts = df["DataHora"].to_numpy()
+    degelo = df["Degelo"].to_numpy(dtype="float64")
+    ligado = degelo == 1                        # amostras lidas em degelo
+    posicoes = np.arange(len(degelo))
+    lido = np.maximum.accumulate(np.where(np.isnan(degelo), -1, posicoes))
+    estado = np.where(lido >= 0, degelo[np.maximum(lido, 0)], 0) == 1
+
+    borda = np.diff(np.concatenate(([0], estado.astype(np.int8), [0])))
+    inicios = np.flatnonzero(borda == 1)
+    fins = np.flatnonzero(borda == -1)          # exclusivo: primeira amostra após o trecho
+    validos = inicios > 0
+    inicios, fins = inicios[validos], fins[validos]
+    # Falha no fim do trecho não conta: o degelo acaba na última amostra lida em degelo
+    ultimo = np.maximum.accumulate(np.where(ligado, posicoes, -1))
+    fins = ultimo[fins - 1] + 1
+    contagem = np.concatenate(([0], np.cumsum(ligado)))
+
+    passo = np.timedelta64(int(round(sample_step(ts) * 60)), "s")
+    fim_ts = ts[fins - 1] + passo               # última amostra em degelo + um passo
+    if "Temp ambiente" in df.columns and len(inicios):
+        temp = df["Temp ambiente"].to_numpy(dtype="float64")
+        # fmax ignora NaN; degelo só com falhas fica com pico NaN
+        pico = np.fmax.reduceat(np.where(ligado, temp, np.nan), inicios)
+    else:
+        pico = np.full(len(inicios), np.nan)
+
+    return pd.DataFrame({
+        "Inicio": ts[inicios],
+        "Fim": fim_ts,
+        "Duracao_min": (fim_ts - ts[inicios]) / np.timedelta64(1, "m"),
+        "Pico": pico,
+        "Amostras": (contagem[fins] - contagem[inicios]).astype(np.int64),
+    })
+
+
+def events_in_range(eventos: pd.DataFrame, start_date, end_date) -> pd.DataFrame:
+    # Degelos iniciados do começo de start_date ao fim de end_date (busca binária)
+    inicio = eventos["Inicio"].searchsorted(pd.Timestamp(start_date), side="left")
+    fim = eventos["Inicio"].searchsorted(pd.Timestamp(end_date) + pd.Timedelta(days=1), side="left")
+    return eventos.iloc[inicio:fim]
+
+
+def load_events(caminho: str) -> pd.DataFrame:
+    # Índice de degelos do arquivo, do cache em disco quando o CSV não mudou
+    return cached_frame(caminho, EVENTS_SUFFIX, lambda: defrost_events(load_file(caminho)),
+                        f"events={EVENTS_VERSION}")
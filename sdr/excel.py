@@ -0,0 +1,154 @@
+# Leitura das planilhas de medição (.xlsx/.xlsm) dos registradores de energia
+# e dos PLCs usadas nos comparativos antigos (deprecated/kWh.py, Consumo.py,
+# ConsumoStepIn.py). A planilha é percorrida linha a linha em modo somente
+# leitura (sem carregar o workbook inteiro) e só as colunas reconhecidas são
+# guardadas. O resultado tem o mesmo formato do parser de CSV e passa pelo
+# mesmo cache colunar (ver sdr.ingest.load_file).
+#
+# Os registradores gravam W e Wh mesmo com "kW"/"kWh" no cabeçalho, e o
+# contador de energia é o totalizador do medidor. Como em kWh.py, as medidas
+# de energia são divididas pela escala (1000 para W/Wh) e o kWh é rebaseado
+# para começar em zero no início do arquivo.
+import numpy as np
+import openpyxl
+import pandas as pd
+from sdr.parser import DTYPE_PADRAO, DTYPES, detect_date_format
+
+EXTENSOES = (".xlsx", ".xlsm")
+
+# Coluna de saída -> trechos (minúsculos) procurados no cabeçalho, na ordem.
+# Mesmos nomes dos scripts antigos e dos exports em inglês dos PLCs.
+COLUNAS = {
+    "Temp ambiente": ["temp ambiente", "temp amb", "ambient temperature"],
+    "Comp": ["compressor 1"],
+    "CapComp": ["comp cap"],
+    "Degelo": ["defrost status", "degelo"],
+}
+
+# Potência mediana acima disso (em "kW") só é plausível em W: nenhuma câmara
+# ou rack medido passa de 1 MW
+POTENCIA_MAX_KW = 1000.0
+# Unidade explícita no cabeçalho: "Potência (W)", "Energia [Wh]"
+UNIDADES_W = ("(w)", "[w]", "(wh)", "[wh]")
+
+
+def detect_columns(header: list) -> dict:
+    # Índice da coluna no cabeçalho -> nome de saída. Data/hora: primeira
+    # coluna com "data"/"hora" (ou a primeira da planilha, como em kWh.py);
+    # kW: contém "kw" mas não "kwh"; kWh: contém "kwh".
+    nomes = [str(c).strip().lower() if c is not None else "" for c in header]
+    escolhidas = {}
+
+    def primeira(condicao):
+        return next((i for i, n in enumerate(nomes) if n and i not in escolhidas and condicao(n)), None)
+
+    dt = primeira(lambda n: "data" in n or "hora" in n)
+    escolhidas[0 if dt is None else dt] = "DataHora"
+    for saida, trechos in COLUNAS.items():
+        for trecho in trechos:
+            i = primeira(lambda n: trecho in n)
+            if i is not None:
+                escolhidas[i] = saida
+                break
+    kwh = primeira(lambda n: "kwh" in n)
+    if kwh is not None:
+        escolhidas[kwh] = "kWh"
+    kw = primeira(lambda n: "kw" in n and "kwh" not in n)
+    if kw is not None:
+        escolhidas[kw] = "kW"
+    # Sem "kw" no nome: coluna em W/Wh declarada no cabeçalho
+    if kwh is None:
+        kwh = primeira(lambda n: "(wh)" in n or "[wh]" in n)
+        if kwh is not None:
+            escolhidas[kwh] = "kWh"
+    if kw is None:
+        kw = primeira(lambda n: "(w)" in n or "[w]" in n)
+        if kw is not None:
+            escolhidas[kw] = "kW"
+    return escolhidas
+
+
+def detect_scale(header: list, colunas: dict, kw: pd.Series | None) -> float:
+    # Divisor das medidas de energia: 1000 se o cabeçalho declara W/Wh ou se a
+    # potência mediana só faz sentido em W; senão 1 (já em kW/kWh)
+    nomes = [str(header[i]).strip().lower() for i, saida in colunas.items() if saida in ("kW", "kWh")]
+    if any(u in n for n in nomes for u in UNIDADES_W):
+        return 1000.0
+    if kw is not None and kw.notna().any() and float(kw.abs().median()) > POTENCIA_MAX_KW:
+        return 1000.0
+    return 1.0
+
+
+def _datas(valores: list) -> pd.Series:
+    # Células de data vêm como datetime ou como texto ("18/06/2025  00:00:00")
+    serie = pd.Series(valores, dtype=object)
+    texto = serie.map(lambda v: isinstance(v, str))
+    datas = pd.to_datetime(serie.where(~texto), errors="coerce")
+    if texto.any():
+        limpo = serie[texto].str.replace(r"\s+", " ", regex=True).str.strip()
+        fmt = detect_date_format(limpo.iloc[0])
+        if fmt is not None:
+            datas[texto] = pd.to_datetime(limpo, format=fmt, errors="coerce")
+        else:
+            datas[texto] = pd.to_datetime(limpo, dayfirst=True, errors="coerce")
+    return datas
+
+
+def energy_from_power(datas: pd.Series, kw: pd.Series) -> np.ndarray:
+    # Energia acumulada (kWh) integrando a potência pela regra do trapézio;
+    # intervalos com potência ausente não somam
+    horas = np.diff(datas.to_numpy("datetime64[ns]")).astype(np.int64) / 3.6e12
+    p = kw.to_numpy(dtype="float64")
+    passos = np.nan_to_num((p[1:] + p[:-1]) / 2 * horas, nan=0.0)
+    return np.concatenate(([0.0], np.cumsum(passos)))
+
+
+def read_workbook(caminho: str, aba: str | None = None, escala: float | None = None) -> pd.DataFrame:
+    # Lê a aba (padrão: a primeira) com coluna "DataHora" e as medidas
+    # reconhecidas. kW e kWh são divididos por `escala` (None = detect_scale)
+    # e o kWh começa em zero; sem coluna kWh, o consumo é integrado a partir de kW.
+    wb = openpyxl.load_workbook(caminho, read_only=True, data_only=True)
+    try:
+        ws = wb[aba] if aba else wb.worksheets[0]
+        linhas = ws.iter_rows(values_only=True)
+        header = next(linhas, None)
+        if header is None:
+            raise ValueError("Arquivo vazio")
+        colunas = detect_columns(header)
+        indices = sorted(colunas)
+        valores = {i: [] for i in indices}
+        for linha in linhas:
+            for i in indices:
+                valores[i].append(linha[i] if i < len(linha) else None)
+    finally:
+        wb.close()
+
+    df = pd.DataFrame({colunas[i]: valores[i] for i in indices})
+    df["DataHora"] = _datas(df["DataHora"].tolist())
+    df = df.dropna(subset=["DataHora"]).sort_values("DataHora", kind="stable").reset_index(drop=True)
+    if df.empty:
+        raise ValueError("Nenhuma data válida encontrada")
+    for c in df.columns:
+        if c != "DataHora":
+            df[c] = pd.to_numeric(df[c], errors="coerce")
+    if escala is None:
+        escala = detect_scale(header, colunas, df.get("kW"))
+    for c in ("kW", "kWh"):
+        if c in df.columns:
+            df[c] = df[c].astype("float64") / escala
+    if "kWh" in df.columns:
+        # Totalizador do medidor -> energia desde o início do arquivo
+        validos = df["kWh"].dropna()
+        if len(validos):
+            df["kWh"] = df["kWh"] - validos.iloc[0]
+    elif "kW" in df.columns:
+        df["kWh"] = energy_from_power(df["DataHora"], df["kW"])
+
+    # Mesmos tipos compactos do parser de CSV; energia acumulada fica em float64
+    for c in df.columns:
+        tipo = DTYPES.get(c, DTYPE_PADRAO) if c not in ("DataHora", "kWh") else None
+        if tipo == "Int8":
+            df[c] = df[c].round().astype(tipo)
+        elif tipo is not None:
+            df[c] = df[c].astype(tipo)
+    return df
@@ -0,0 +1,145 @@
+# Grade regular de amostras. Os exports têm linhas faltando, instantes
+# repetidos e falhas "---". Na ingestão, cada série é posta numa grade de passo
+# fixo (5 min nos controladores): uma linha por instante, na ordem, sem
+# repetição. Instantes sem dado ficam ausentes (NaN/<NA>). Falhas curtas são
+# preenchidas segundo FILL_POLICY; as longas continuam ausentes e ficam fora
+# dos denominadores (ver sdr.rollup). O índice de falhas registra início e fim
+# de cada intervalo sem nenhum dado no export.
+import json
+import numpy as np
+import pandas as pd
+
+PASSO_PADRAO = pd.Timedelta(minutes=5)
+# Coluna -> maior falha (em amostras) preenchida com o último valor; falhas
+# mais longas ficam inteiras sem preencher. Colunas não listadas: FILL_PADRAO.
+FILL_POLICY = {"Temp ambiente": 3, "Comp": 3, "Degelo": 3}
+FILL_PADRAO = 0
+GAPS_COLUNAS = ["Inicio", "Fim", "Amostras", "Preenchida"]
+
+
+def policy_key(politica: dict = FILL_POLICY, padrao: int = FILL_PADRAO) -> str:
+    # Entra na assinatura dos caches: mudar a política invalida os derivados
+    return json.dumps([sorted(politica.items()), padrao], ensure_ascii=False)
+
+
+def grid_step(ts: np.ndarray) -> pd.Timedelta:
+    # Passo da grade: mediana dos intervalos positivos entre amostras, em
+    # minutos inteiros (ou segundos, para registradores mais rápidos)
+    ns = np.sort(np.asarray(ts, dtype="datetime64[ns]").view(np.int64))
+    difs = np.diff(ns)
+    difs = difs[difs > 0]
+    if not len(difs):
+        return PASSO_PADRAO
+    passo = pd.Timedelta(int(np.median(difs)), unit="ns")
+    return passo.round("1min") if passo >= pd.Timedelta(minutes=1) else passo.round("1s")
+
+
+def to_grid(df: pd.DataFrame, passo: pd.Timedelta | None = None) -> pd.DataFrame:
+    # df: frame com coluna "DataHora" (qualquer ordem, com repetições). Cada
+    # instante vai para o ponto mais próximo da grade (múltiplos de `passo`);
+    # se dois caem no mesmo ponto vale o último do arquivo.
+    passo = passo or grid_step(df["DataHora"].to_numpy())
+    if df.empty:
+        return df.reset_index(drop=True)
+    step = passo.value
+    ns = df["DataHora"].to_numpy("datetime64[ns]").view(np.int64)
+    slot = (ns + step // 2) // step
+    ordem = np.argsort(slot, kind="stable")
+    s = slot[ordem]
+    ultimo = np.r_[s[1:] != s[:-1], True]
+    linhas, pos = ordem[ultimo], s[ultimo] - s[0]
+    n = int(s[-1] - s[0]) + 1
+
+    grade = {"DataHora": ((s[0] + np.arange(n)) * step).view("datetime64[ns]")}
+    for c in df.columns:
+        if c == "DataHora":
+            continue
+        serie = df[c]
+        if isinstance(serie.dtype, pd.api.extensions.ExtensionDtype):
+            # Inteiros com ausente (Int8): valores + máscara
+            tipo = serie.dtype.numpy_dtype
+            escolhidas = serie.array[linhas]
+            valores = np.zeros(n, dtype=tipo)
+            mascara = np.ones(n, dtype=bool)
+            valores[pos] = escolhidas.to_numpy(tipo, na_value=0)
+            mascara[pos] = escolhidas.isna()
+            grade[c] = pd.arrays.IntegerArray(valores, mascara)
+        else:
+            valores = np.full(n, np.nan, dtype=serie.dtype)
+            valores[pos] = serie.to_numpy()[linhas]
+            grade[c] = valores
+    return pd.DataFrame(grade)
+
+
+def _ausentes(df: pd.DataFrame) -> np.ndarray:
+    # Instantes sem nenhuma medida (linha faltando ou só "---")
+    medidas = [c for c in df.columns if c != "DataHora"]
+    if not medidas:
+        return np.zeros(len(df), dtype=bool)
+    return df[medidas].isna().to_numpy().all(axis=1)
+
+
+def _runs(mascara: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    # Início e fim (exclusivo) de cada sequência de True
+    borda = np.diff(np.concatenate(([0], mascara.astype(np.int8), [0])))
+    return np.flatnonzero(borda == 1), np.flatnonzero(borda == -1)
+
+
+def gap_index(grade: pd.DataFrame, politica: dict = FILL_POLICY, padrao: int = FILL_PADRAO) -> pd.DataFrame:
+    # grade: saída de to_grid (antes do preenchimento). Uma linha por falha:
+    # Inicio (primeiro instante sem dado), Fim (primeiro instante com dado
+    # depois dela), Amostras e Preenchida (curta o bastante para a política
+    # da temperatura, ou da coluna padrão se não houver temperatura).
+    inicios, fins = _runs(_ausentes(grade))
+    ts = grade["DataHora"].to_numpy()
+    passo = ts[1] - ts[0] if len(ts) > 1 else PASSO_PADRAO.to_timedelta64()
+    amostras = (fins - inicios).astype(np.int64)
+    limite = politica.get("Temp ambiente", padrao) if "Temp ambiente" in grade.columns else padrao
+    return pd.DataFrame({
+        "Inicio": ts[inicios] if len(ts) else np.array([], dtype="datetime64[ns]"),
+        "Fim": ts[inicios] + amostras * passo if len(ts) else np.array([], dtype="datetime64[ns]"),
+        "Amostras": amostras,
+        "Preenchida": (inicios > 0) & ((limite is None) | (amostras <= (limite or 0))),
+    }, columns=GAPS_COLUNAS)
+
+
+def gaps_in_range(falhas: pd.DataFrame, start_date, end_date) -> pd.DataFrame:
+    # Falhas que tocam o período (do começo de start_date ao fim de end_date)
+    inicio = falhas["Fim"].searchsorted(pd.Timestamp(start_date), side="right")
+    fim = falhas["Inicio"].searchsorted(pd.Timestamp(end_date) + pd.Timedelta(days=1), side="left")
+    return falhas.iloc[inicio:fim]
+
+
+def fill_gaps(grade: pd.DataFrame, politica: dict = FILL_POLICY, padrao: int = FILL_PADRAO) -> pd.DataFrame:
+    # Repete o último valor em falhas de até `limite` amostras de cada coluna
+    # (None = sem limite, 0 = não preenche); falhas maiores ficam ausentes
+    saida = {}
+    for c in grade.columns:
+        limite = politica.get(c, padrao)
+        if c == "DataHora" or limite == 0:
+            saida[c] = grade[c]
+            continue
+        ausente = grade[c].isna().to_numpy()
+        inicios, fins = _runs(ausente)
+        curtas = inicios > 0
+        if limite is not None:
+            curtas &= (fins - inicios) <= limite
+        if not curtas.any():
+            saida[c] = grade[c]
+            continue
+        # Posição do último valor presente antes de cada instante
+        n = len(grade)
+        ultimo = np.maximum.accumulate(np.where(ausente, 0, np.arange(n)))
+        marca = np.zeros(n + 1, dtype=np.int64)
+        np.add.at(marca, inicios[curtas], 1)
+        np.add.at(marca, fins[curtas], -1)
+        preencher = np.cumsum(marca[:-1]) > 0
+        origem = np.where(preencher, ultimo, np.arange(n))
+        saida[c] = grade[c].take(origem).reset_index(drop=True)
+    return pd.DataFrame(saida)
+
+
+def regularize(df: pd.DataFrame, passo: pd.Timedelta | None = None, politica: dict = FILL_POLICY,
+               padrao: int = FILL_PADRAO) -> pd.DataFrame:
+    # Grade regular + preenchimento das falhas curtas: formato de load_file
+    return fill_gaps(to_grid(df, passo), politica, padrao)
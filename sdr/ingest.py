@@ -0,0 +1,141 @@
+# Camada de ingestão dos arquivos exportados pelos controladores.
+# Cada CSV (ou planilha .xlsx/.xlsm, ver sdr.excel) é convertido uma única vez
+# para um arquivo colunar (Parquet) ao lado do original; enquanto tamanho e
+# mtime do original não mudarem, a leitura é feita direto do Parquet, sem
+# reprocessar texto nem inferir datas linha a linha.
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sdr.excel import EXTENSOES, read_workbook
+from sdr.grid import fill_gaps, gap_index, policy_key, to_grid
+from sdr.parser import read_sdr_csv
+
+# Versão do formato do cache: incrementar quando o parser mudar a saída. A
+# política de preenchimento da grade entra junto (ver sdr.grid).
+CACHE_VERSION = "5"
+FORMAT_VERSION = f"{CACHE_VERSION};{policy_key()}"
+CACHE_SUFFIX = ".parquet"
+GAPS_SUFFIX = ".gaps.parquet"
+
+
+def cache_path(caminho: str, sufixo: str = CACHE_SUFFIX) -> str:
+    # data/loja/L1.csv -> data/loja/L1.csv.parquet. A extensão do original fica
+    # no nome: L1.csv e L1.xlsx na mesma pasta não dividem o cache
+    return caminho + sufixo
+
+
+def _assinatura(caminho: str, chave: str = "") -> dict:
+    # Chave de validade do cache: tamanho + mtime do CSV + versão do formato
+    # + parâmetros usados para derivar o conteúdo (quando houver)
+    info = os.stat(caminho)
+    return {
+        b"sdr_size": str(info.st_size).encode(),
+        b"sdr_mtime_ns": str(info.st_mtime_ns).encode(),
+        b"sdr_version": FORMAT_VERSION.encode(),
+        b"sdr_key": chave.encode(),
+    }
+
+
+def _cache_valido(caminho: str, destino: str, chave: str = "") -> bool:
+    if not os.path.exists(destino):
+        return False
+    try:
+        meta = pq.read_schema(destino).metadata or {}
+    except (OSError, pa.ArrowException):
+        return False
+    return all(meta.get(k) == v for k, v in _assinatura(caminho, chave).items())
+
+
+def _gravar_cache(df: pd.DataFrame, caminho: str, destino: str, chave: str = "") -> None:
+    tabela = pa.Table.from_pandas(df, preserve_index=False)
+    meta = dict(tabela.schema.metadata or {})
+    meta.update(_assinatura(caminho, chave))
+    tabela = tabela.replace_schema_metadata(meta)
+    # Grava em arquivo temporário único (as sessões do Streamlit são threads do
+    # mesmo processo) e troca atomicamente, para que outra sessão nunca leia
+    # um Parquet pela metade
+    tmp = None
+    try:
+        fd, tmp = tempfile.mkstemp(prefix=f"{os.path.basename(destino)}.", suffix=".tmp",
+                                   dir=os.path.dirname(os.path.abspath(destino)))
+        os.close(fd)
+        pq.write_table(tabela, tmp)
+        os.replace(tmp, destino)
+    except OSError:
+        # Diretório somente leitura: segue sem cache
+        if tmp is not None and os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def cached_frame(caminho: str, sufixo: str, construir, chave: str = "") -> pd.DataFrame:
+    # Devolve o Parquet derivado de `caminho` se ainda for válido; senão chama
+    # construir() e grava o resultado para as próximas leituras
+    destino = cache_path(caminho, sufixo)
+    if _cache_valido(caminho, destino, chave):
+        return pd.read_parquet(destino)
+    df = construir()
+    _gravar_cache(df, caminho, destino, chave)
+    return df
+
+
+def read_raw(caminho: str) -> pd.DataFrame:
+    # Export do controlador (CSV) ou planilha de medição (.xlsx/.xlsm), como está
+    if caminho.lower().endswith(EXTENSOES):
+        return read_workbook(caminho)
+    return read_sdr_csv(caminho)
+
+
+def read_source(caminho: str) -> tuple[pd.DataFrame, pd.DataFrame]:
+    # Uma leitura do original, posta na grade regular uma vez: (série com as
+    # falhas curtas preenchidas, índice de falhas da grade antes do preenchimento)
+    grade = to_grid(read_raw(caminho))
+    return fill_gaps(grade), gap_index(grade)
+
+
+def _ingerir(caminho: str) -> tuple[pd.DataFrame, pd.DataFrame]:
+    # Cache do arquivo ausente ou velho: grava os dois derivados de uma vez,
+    # para que load_gaps (ou load_file) depois não leia o original de novo
+    df, falhas = read_source(caminho)
+    _gravar_cache(df, caminho, cache_path(caminho, CACHE_SUFFIX))
+    _gravar_cache(falhas, caminho, cache_path(caminho, GAPS_SUFFIX))
+    return df, falhas
+
+
+def _do_cache(caminho: str, sufixo: str, posicao: int) -> pd.DataFrame:
+    destino = cache_path(caminho, sufixo)
+    if _cache_valido(caminho, destino):
+        return pd.read_parquet(destino)
+    return _ingerir(caminho)[posicao]
+
+
+def load_file(caminho: str) -> pd.DataFrame:
+    # Lê o arquivo do controlador usando o cache colunar quando ele estiver atualizado
+    return _do_cache(caminho, CACHE_SUFFIX, 0)
+
+
+def load_gaps(caminho: str) -> pd.DataFrame:
+    # Índice de falhas do arquivo (ver sdr.grid.gap_index), do cache em disco
+    return _do_cache(caminho, GAPS_SUFFIX, 1)
+
+
+def load_files(paths: dict, max_workers: int | None = None, loader=load_file) -> tuple[dict, dict]:
+    # Carrega vários arquivos em paralelo (threads: a leitura de CSV/Parquet
+    # libera o GIL). As chaves podem ser nomes de câmara ou (loja, câmara),
+    # para carregar várias lojas de uma vez. Retorna (frames, erros), na ordem
+    # de `paths`; erros mapeia a chave para a exceção levantada. `loader` troca
+    # a função de leitura (ex.: load_rollup).
+    frames, erros = {}, {}
+    if not paths:
+        return frames, erros
+    workers = max_workers or min(len(paths), os.cpu_count() or 1, 16)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futuros = {chave: pool.submit(loader, caminho) for chave, caminho in paths.items()}
+        for chave, futuro in futuros.items():
+            try:
+                frames[chave] = futuro.result()
+            except Exception as e:
+                erros[chave] = e
+    return frames, erros
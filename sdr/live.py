@@ -0,0 +1,303 @@
+# Modo ao vivo: os controladores continuam acrescentando linhas de 5 min aos
+# CSVs exportados. Cada arquivo é lido por completo uma vez e, a partir daí,
+# só o trecho acrescentado desde o último byte lido é convertido e anexado.
+#
+# As amostras ficam em buffers que crescem dobrando a capacidade (anexar não
+# copia o histórico) e os derivados (degelos, rollup diário, falhas e
+# pirâmide) são refeitos só a partir da meia-noite do dia anterior à primeira
+# linha nova; o que vem antes é mantido como está.
+import io
+import os
+import threading
+import numpy as np
+import pandas as pd
+from sdr.events import defrost_events
+from sdr.excel import EXTENSOES
+from sdr.grid import gap_index, grid_step, regularize
+from sdr.ingest import load_file
+from sdr.lod import build_pyramid
+from sdr.parser import ENCODING, detect_layout, parse_rows, read_header
+from sdr.partition import ChamberSeries, data_range
+from sdr.performance import RECOVERY_WINDOW
+from sdr.rollup import daily_rollup
+from sdr.schedule import HORARIO_PADRAO, Schedule
+from sdr.store import COLUNAS_ANALISE, StoreData
+
+DIA_NS = pd.Timedelta(days=1).value
+
+
+class _Buffer:
+    # Array que cresce dobrando a capacidade: anexar custa O(linhas novas)
+    # amortizado e view() devolve os n primeiros valores sem cópia. Views já
+    # entregues continuam válidas: nada antes de n é reescrito.
+    __slots__ = ("dados", "n")
+
+    def __init__(self, valores: np.ndarray):
+        self.dados = np.array(valores, copy=True)
+        self.n = len(valores)
+
+    def append(self, valores: np.ndarray) -> None:
+        fim = self.n + len(valores)
+        if fim > len(self.dados):
+            novo = np.empty(max(fim, 2 * len(self.dados), 1024), dtype=self.dados.dtype)
+            novo[:self.n] = self.dados[:self.n]
+            self.dados = novo
+        self.dados[self.n:fim] = valores
+        self.n = fim
+
+    def view(self) -> np.ndarray:
+        return self.dados[:self.n]
+
+
+class _Coluna:
+    # Coluna de amostras: numpy, ou valores + máscara para inteiros com
+    # ausente (Int8), montados de volta em IntegerArray sem cópia
+    __slots__ = ("valores", "mascara")
+
+    def __init__(self, serie: pd.Series):
+        if isinstance(serie.dtype, pd.api.extensions.ExtensionDtype):
+            tipo = serie.dtype.numpy_dtype
+            self.valores = _Buffer(serie.array.to_numpy(tipo, na_value=0))
+            self.mascara = _Buffer(serie.array.isna())
+        else:
+            self.valores = _Buffer(serie.to_numpy())
+            self.mascara = None
+
+    def append(self, serie: pd.Series) -> None:
+        tipo = self.valores.dados.dtype
+        if self.mascara is None:
+            self.valores.append(serie.to_numpy(dtype=tipo, na_value=np.nan))
+        else:
+            self.valores.append(serie.array.to_numpy(tipo, na_value=0))
+            self.mascara.append(serie.array.isna())
+
+    def view(self):
+        if self.mascara is None:
+            return self.valores.view()
+        return pd.arrays.IntegerArray(self.valores.view(), self.mascara.view())
+
+
+class LiveSeries:
+    # Série de uma câmara mantida em memória e atualizada pelo final do arquivo
+
+    def __init__(self, caminho: str):
+        self.caminho = caminho
+        self.offset = 0       # bytes do arquivo já incorporados
+        self.version = 0      # incrementa a cada mudança das amostras
+        self._tempo = None    # _Buffer de instantes (int64, ns)
+        self._colunas = {}    # nome -> _Coluna
+        self._layout = None
+        self._passo = None
+        self._derivados = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return 0 if self._tempo is None else self._tempo.n
+
+    def series(self) -> ChamberSeries:
+        # Amostras atuais como ChamberSeries (views dos buffers)
+        if self._tempo is None:
+            return ChamberSeries(np.empty(0, dtype=np.int64), {})
+        return ChamberSeries(self._tempo.view(), {c: col.view() for c, col in self._colunas.items()})
+
+    @property
+    def df(self) -> pd.DataFrame:
+        # DataFrame com coluna "DataHora", como load_file
+        return self.series().frame().reset_index()
+
+    def _carregar(self) -> int:
+        # Leitura completa (via cache colunar); o final do arquivo no momento do
+        # stat vira o ponto de partida das leituras incrementais
+        if self.caminho.lower().endswith(EXTENSOES):
+            # Planilha não cresce por linhas no final: não há leitura incremental
+            raise ValueError("Planilha de medição não tem modo ao vivo (desligue o modo ao vivo)")
+        tamanho = os.path.getsize(self.caminho)
+        df = load_file(self.caminho)
+        self._tempo = _Buffer(df["DataHora"].to_numpy("datetime64[ns]").view(np.int64))
+        self._colunas = {c: _Coluna(df[c]) for c in df.columns if c != "DataHora"}
+        self._layout = detect_layout(*read_header(self.caminho, 0))
+        self._passo = grid_step(df["DataHora"].to_numpy())
+        self._derivados = None
+        self.offset = tamanho
+        self.version += 1
+        return len(df)
+
+    def _ler_final(self, tamanho: int) -> str:
+        with open(self.caminho, "rb") as f:
+            # Se o offset caiu no meio de uma linha, descarta até a próxima
+            inicio_linha = True
+            if self.offset > 0:
+                f.seek(self.offset - 1)
+                inicio_linha = f.read(1) == b"\n"
+            bloco = f.read(tamanho - self.offset)
+        if not inicio_linha:
+            quebra = bloco.find(b"\n")
+            if quebra < 0:
+                return ""
+            self.offset += quebra + 1
+            bloco = bloco[quebra + 1:]
+        # Só consome linhas completas; a última pode estar sendo escrita
+        fim = bloco.rfind(b"\n")
+        if fim < 0:
+            return ""
+        self.offset += fim + 1
+        return bloco[:fim + 1].decode(ENCODING)
+
+    def update(self) -> int:
+        # Incorpora as linhas novas do arquivo e retorna quantas foram anexadas
+        with self._lock:
+            if self._tempo is None:
+                return self._carregar()
+            tamanho = os.path.getsize(self.caminho)
+            if tamanho < self.offset:
+                # Arquivo truncado ou substituído: recomeça do zero
+                return self._carregar()
+            if tamanho == self.offset:
+                return 0
+            texto = self._ler_final(tamanho)
+            if not texto:
+                return 0
+            novos = parse_rows(io.StringIO(texto), self._layout)
+            # Descarta linhas já conhecidas (releitura parcial após o load inicial)
+            n = self._tempo.n
+            if n:
+                novos = novos[novos["DataHora"] > pd.Timestamp(int(self._tempo.dados[n - 1]))]
+            if novos.empty:
+                return 0
+            if n:
+                # Mesma grade da carga completa, a partir da última amostra
+                # conhecida (que entra só para ancorar a grade e preencher
+                # falhas curtas)
+                ultimo = int(self._tempo.dados[n - 1])
+                ancora = self.series().between(ultimo, ultimo + 1).frame().reset_index()
+                novos = regularize(pd.concat([ancora, novos], ignore_index=True), self._passo).iloc[len(ancora):]
+            else:
+                novos = regularize(novos, self._passo)
+            self._tempo.append(novos["DataHora"].to_numpy("datetime64[ns]").view(np.int64))
+            for c, coluna in self._colunas.items():
+                coluna.append(novos[c])
+            self.version += 1
+            return len(novos)
+
+    def derived(self, horario: Schedule = HORARIO_PADRAO, recuperacao: tuple = RECOVERY_WINDOW) -> dict:
+        # Degelos, rollup diário, falhas e pirâmide da série, em dia com as
+        # amostras: "eventos", "rollup", "lacunas", "piramide"
+        with self._lock:
+            n = len(self)
+            d = self._derivados
+            if d is None or d["chave"] != (horario, recuperacao) or d["n"] > n:
+                d = self._derivados = _derivar(self.series(), horario, recuperacao)
+            elif d["n"] < n:
+                d = self._derivados = _estender(d, self.series(), horario, recuperacao)
+            return d
+
+
+def _quadro(serie: ChamberSeries) -> pd.DataFrame:
+    return serie.frame().reset_index()
+
+
+def _derivar(serie: ChamberSeries, horario: Schedule, recuperacao: tuple) -> dict:
+    # Derivados do histórico inteiro (primeira carga ou mudança de horário/janela)
+    df = _quadro(serie)
+    eventos = defrost_events(df)
+    return {
+        "chave": (horario, recuperacao),
+        "n": len(serie),
+        "eventos": eventos,
+        "rollup": daily_rollup(df, eventos, horario=horario, recuperacao=recuperacao),
+        "lacunas": gap_index(df),
+        "piramide": build_pyramid(serie.series("Temp ambiente")) if "Temp ambiente" in serie.colunas else None,
+    }
+
+
+def _estender(d: dict, serie: ChamberSeries, horario: Schedule, recuperacao: tuple) -> dict:
+    # Refaz os derivados a partir da meia-noite do dia anterior à primeira
+    # amostra nova (a, em posição) e junta com o que já havia antes disso.
+    # Degelo e falha em curso no corte são recalculados inteiros.
+    tempo = serie.tempo
+    corte = int(tempo[d["n"]]) // DIA_NS * DIA_NS - DIA_NS
+    a = int(np.searchsorted(tempo, corte, side="left"))
+    if a == 0:
+        return _derivar(serie, horario, recuperacao)
+
+    # Degelos: a partir da última amostra lida fora de degelo antes do corte
+    # (falha longa mantém o estado anterior, ver defrost_events); os iniciados
+    # antes dela já terminaram e ficam como estavam
+    antigos = d["eventos"]
+    p = _ultimo_desligado(serie, a)
+    if p < 0:
+        eventos = defrost_events(_quadro(serie))
+        dia = int(tempo[0]) // DIA_NS * DIA_NS
+    else:
+        # Degelo refeito desde antes do corte (falha longa) muda a duração
+        # contada no dia em que começou: o rollup recomeça nesse dia
+        dia = min(corte, int(tempo[p]) // DIA_NS * DIA_NS)
+        inicio_p = pd.Timestamp(int(tempo[p]))
+        novos = defrost_events(_quadro(serie.between(int(tempo[p]), int(tempo[-1]) + 1)))
+        eventos = pd.concat([antigos[antigos["Inicio"] < inicio_p], novos], ignore_index=True)
+
+    # Rollup: dias inteiros a partir de `dia`; os degelos até o fim da janela
+    # de recuperação antes dele ainda marcam amostras depois dele
+    proximos = eventos[eventos["Inicio"] >= pd.Timestamp(dia) - pd.Timedelta(recuperacao[1])]
+    cauda = daily_rollup(_quadro(serie.between(dia, int(tempo[-1]) + 1)), proximos,
+                         horario=horario, recuperacao=recuperacao)
+    rollup = d["rollup"]
+    rollup = pd.concat([rollup[rollup.index.get_level_values("Dia") < pd.Timestamp(dia)], cauda])
+
+    # Falhas: a partir da última amostra presente antes do corte (se tempo[a-1]
+    # está numa falha, recua até a amostra que a precede)
+    lacunas = d["lacunas"]
+    b = a - 1
+    em_curso = lacunas[(lacunas["Inicio"] <= pd.Timestamp(int(tempo[b]))) & (lacunas["Fim"] > pd.Timestamp(int(tempo[b])))]
+    if len(em_curso):
+        b = int(np.searchsorted(tempo, em_curso["Inicio"].iloc[0].value, side="left")) - 1
+    if b < 0:
+        lacunas = gap_index(_quadro(serie))
+    else:
+        inicio_b = pd.Timestamp(int(tempo[b]))
+        lacunas = pd.concat([lacunas[lacunas["Inicio"] < inicio_b],
+                             gap_index(_quadro(serie.between(int(tempo[b]), int(tempo[-1]) + 1)))],
+                            ignore_index=True)
+
+    # Pirâmide: os intervalos de todos os níveis se alinham à meia-noite
+    piramide = d["piramide"]
+    if piramide is not None:
+        nova = build_pyramid(serie.between(corte, int(tempo[-1]) + 1).series("Temp ambiente"))
+        piramide = {nivel: pd.concat([antiga[antiga.index < pd.Timestamp(corte)], nova[nivel]])
+                    for nivel, antiga in piramide.items()}
+
+    return {"chave": d["chave"], "n": len(serie), "eventos": eventos, "rollup": rollup,
+            "lacunas": lacunas, "piramide": piramide}
+
+
+def _ultimo_desligado(serie: ChamberSeries, a: int, bloco: int = 1024) -> int:
+    # Posição da última amostra antes de `a` com Degelo == 0 lido (-1 se não há)
+    degelo = serie.colunas.get("Degelo")
+    if degelo is None:
+        return a - 1
+    fim = a
+    while fim > 0:
+        inicio = max(fim - bloco, 0)
+        desligado = np.flatnonzero(np.asarray(degelo[inicio:fim], dtype="float64") == 0)
+        if len(desligado):
+            return inicio + int(desligado[-1])
+        fim = inicio
+    return -1
+
+
+def live_store_data(series: dict, horario: Schedule = HORARIO_PADRAO,
+                    recuperacao: tuple = RECOVERY_WINDOW) -> StoreData:
+    # series: origem -> LiveSeries já atualizada. Monta a loja sobre as views
+    # das amostras e os derivados incrementais, sem copiar o histórico.
+    partes, rollups, eventos, piramides, lacunas = {}, {}, {}, {}, {}
+    for nome, live in series.items():
+        # Derivados primeiro; as amostras são cortadas no ponto que eles cobrem
+        # (outra sessão pode ter anexado linhas no meio tempo)
+        d = live.derived(horario, recuperacao)
+        serie, n = live.series(), d["n"]
+        partes[nome] = ChamberSeries(serie.tempo[:n], {c: v[:n] for c, v in serie.colunas.items()
+                                                       if c in COLUNAS_ANALISE})
+        rollups[nome], eventos[nome], lacunas[nome] = d["rollup"], d["eventos"], d["lacunas"]
+        if d["piramide"] is not None:
+            piramides[nome] = d["piramide"]
+    return StoreData(partes, rollups, eventos, piramides, data_range(partes), lacunas, horario)
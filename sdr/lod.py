@@ -0,0 +1,37 @@
+# Pirâmide de resolução (min/max/média por intervalo) da temperatura de cada
+# câmara, para o gráfico enviar ao navegador só os pontos que cabem na tela.
+# Os picos continuam visíveis porque cada intervalo guarda o mínimo e o máximo.
+import pandas as pd
+
+# Níveis da pirâmide, do mais fino ao mais grosso
+NIVEIS = ["15min", "1h", "6h", "1D"]
+# Largura útil típica do gráfico na página (px)
+LARGURA_PX = 1200
+
+
+def build_pyramid(temp: pd.Series) -> dict:
+    # temp: série indexada por DataHora. Retorna nível -> DataFrame com
+    # colunas Min, Max e Media, indexado pelo início de cada intervalo.
+    # Os níveis grossos são agregados a partir do de 15 min (soma/contagem).
+    piramide = {}
+    base = temp.resample(NIVEIS[0]).agg(["min", "max", "sum", "count"])
+    for nivel in NIVEIS:
+        if nivel != NIVEIS[0]:
+            base = base.resample(nivel).agg({"min": "min", "max": "max", "sum": "sum", "count": "sum"})
+        com_dados = base[base["count"] > 0]
+        piramide[nivel] = pd.DataFrame({
+            "Min": com_dados["min"],
+            "Max": com_dados["max"],
+            "Media": com_dados["sum"] / com_dados["count"],
+        })
+    return piramide
+
+
+def choose_level(start_date, end_date, largura_px: int = LARGURA_PX) -> str | None:
+    # Nível mais grosso que ainda dá ~1 ponto por pixel (min e max são 2 pontos
+    # por intervalo); None = amostras originais
+    duracao = pd.Timestamp(end_date) + pd.Timedelta(days=1) - pd.Timestamp(start_date)
+    for nivel in reversed(NIVEIS):
+        if duracao / pd.Timedelta(nivel) >= largura_px / 2:
+            return nivel
+    return None
@@ -0,0 +1,98 @@
+# Cache em memória, compartilhado entre sessões, dos dados derivados de cada
+# arquivo (frame, eventos, rollup) e das lojas montadas a partir deles.
+# A chave de cada entrada inclui tamanho + mtime do(s) arquivo(s): um CSV
+# alterado invalida só as suas entradas. O total em bytes é limitado e as
+# entradas menos usadas recentemente são descartadas (LRU).
+import os
+import sys
+import threading
+from collections import OrderedDict
+import pandas as pd
+from sdr.partition import ChamberSeries
+
+MAX_BYTES = int(os.environ.get("SDR_CACHE_MB", "1024")) * 1024 * 1024
+
+
+def file_signature(caminho: str) -> tuple:
+    info = os.stat(caminho)
+    return info.st_size, info.st_mtime_ns
+
+
+def nbytes(valor) -> int:
+    # Estimativa do tamanho em memória (DataFrames pelo memory_usage profundo).
+    # Frames e séries mapeados de disco (sdr.colstore) não contam: as páginas
+    # são do cache do sistema, compartilhadas entre processos.
+    if isinstance(valor, pd.DataFrame) and valor.attrs.get("mmap"):
+        return 0
+    if isinstance(valor, ChamberSeries):
+        return 0 if valor.mmap else valor.nbytes()
+    if isinstance(valor, (pd.DataFrame, pd.Series, pd.Index)):
+        uso = valor.memory_usage(deep=True)
+        return int(uso.sum()) if hasattr(uso, "sum") else int(uso)
+    if isinstance(valor, dict):
+        return sum(nbytes(v) for v in valor.values())
+    if isinstance(valor, (list, tuple)):
+        return sum(nbytes(v) for v in valor)
+    return sys.getsizeof(valor)
+
+
+class FileCache:
+    # LRU limitado em bytes; chave = (nome, tipo) e assinatura = estado dos arquivos
+
+    def __init__(self, max_bytes: int = MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = self.misses = self.evictions = 0
+        self._entradas = OrderedDict()   # chave -> (assinatura, valor, bytes)
+        self._lock = threading.Lock()
+
+    def get(self, chave, assinatura):
+        with self._lock:
+            entrada = self._entradas.get(chave)
+            if entrada is not None and entrada[0] == assinatura:
+                self._entradas.move_to_end(chave)
+                self.hits += 1
+                return entrada[1]
+            self.misses += 1
+            return None
+
+    def put(self, chave, assinatura, valor, tamanho: int | None = None) -> None:
+        tamanho = nbytes(valor) if tamanho is None else tamanho
+        with self._lock:
+            # A versão anterior da mesma chave (arquivo alterado) sai na hora
+            antiga = self._entradas.pop(chave, None)
+            if antiga is not None:
+                self.bytes -= antiga[2]
+            if tamanho > self.max_bytes:
+                return
+            self._entradas[chave] = (assinatura, valor, tamanho)
+            self.bytes += tamanho
+            while self.bytes > self.max_bytes:
+                _, (_, _, liberado) = self._entradas.popitem(last=False)
+                self.bytes -= liberado
+                self.evictions += 1
+
+    def get_or_load(self, caminho: str, tipo: str, loader):
+        # Valor derivado de um arquivo; recarrega se o arquivo mudou desde a carga
+        assinatura = file_signature(caminho)
+        valor = self.get((caminho, tipo), assinatura)
+        if valor is None:
+            valor = loader(caminho)
+            self.put((caminho, tipo), assinatura, valor)
+        return valor
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entradas.clear()
+            self.bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entradas": len(self._entradas),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
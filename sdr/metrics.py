@@ -0,0 +1,44 @@
+# Métricas de eficiência energética do degelo (agenda fixa x SDR).
+import numpy as np
+import pandas as pd
+
+CYCLES_DAY  = 4        # degelos por dia na agenda convencional
+CYCLE_HOURS = 45 / 60  # duração de cada degelo na agenda (h)
+
+COLUNAS = ["Previsto", "Real", "Economia", "Economia (%)", "Ciclos", "Eventos"]
+
+
+def efficiency_table(rollups: dict, potencias: dict, start_date, end_date,
+                     cycles_day: int = CYCLES_DAY, cycle_hours: float = CYCLE_HOURS) -> pd.DataFrame:
+    # Degelos realizados e consumo previsto/real de cada câmara de `potencias`,
+    # somando as linhas diárias dos rollups (origem -> rollup, ver sdr.rollup).
+    # Previsto: agenda fixa de cycles_day degelos de cycle_hours; Real: potência
+    # × duração medida dos degelos. Retorna uma linha por câmara, indexada por "Origem".
+    inicio, fim = pd.Timestamp(start_date), pd.Timestamp(end_date)
+    eventos, horas = {}, {}
+    for origem, rollup in rollups.items():
+        dias = rollup.index.get_level_values("Dia")
+        no_periodo = (dias >= inicio) & (dias <= fim)
+        eventos[origem] = int(rollup["Degelos"].to_numpy()[no_periodo].sum())
+        horas[origem] = float(rollup["Degelo_min"].to_numpy()[no_periodo].sum()) / 60
+
+    dias = (end_date - start_date).days + 1
+    pot = pd.Series(potencias, dtype="float64")
+    carregada = pot.index.isin(list(rollups))
+
+    tabela = pd.DataFrame(index=pd.Index(pot.index, name="Origem"))
+    # Câmaras sem dados carregados não entram na conta
+    tabela["Ciclos"] = np.where(carregada, cycles_day * dias, 0)
+    tabela["Eventos"] = pd.Series(eventos, dtype="int64").reindex(pot.index, fill_value=0)
+    tabela["Previsto"] = pot * cycle_hours * tabela["Ciclos"]
+    tabela["Real"] = pot * pd.Series(horas, dtype="float64").reindex(pot.index, fill_value=0.0)
+    tabela["Economia"] = tabela["Previsto"] - tabela["Real"]
+    tabela["Economia (%)"] = (tabela["Economia"] / tabela["Previsto"] * 100).where(tabela["Previsto"] != 0, 0.0)
+    return tabela[COLUNAS]
+
+
+def efficiency_total(tabela: pd.DataFrame) -> pd.Series:
+    # Soma das câmaras, com a economia percentual recalculada sobre o total
+    total = tabela[["Previsto", "Real", "Economia", "Ciclos", "Eventos"]].sum()
+    total["Economia (%)"] = total["Economia"] / total["Previsto"] * 100 if total["Previsto"] else 0
+    return total[COLUNAS]
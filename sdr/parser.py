@@ -0,0 +1,134 @@
+# Parser dos CSVs exportados pelos controladores SDR.
+# Formato: separador ";", vírgula decimal ("-20,2"), "---" para valor ausente,
+# coluna vazia no final de cada linha e data no formato "2025-08-04 00:00:00.0".
+from datetime import datetime
+from typing import NamedTuple
+import pandas as pd
+
+SEP = ";"
+ENCODING = "utf-8"
+NA_VALUES = ["---"]
+
+# Tipos das colunas conhecidas. As medidas têm resolução de 0,1 °C, então
+# float32 (~7 dígitos) é exato para o que o controlador exporta e ocupa metade
+# de float64; os status liga/desliga são inteiros de 1 byte com ausente (<NA>).
+# Colunas não listadas são lidas como float32.
+DTYPES = {
+    "Temp ambiente": "float32",
+    "Comp": "Int8",
+    "Degelo": "Int8",
+    "Temp evap": "float32",
+    "SH": "float32",
+    "Temp succao": "float32",
+}
+DTYPE_PADRAO = "float32"
+
+# Formatos de data aceitos, na ordem de tentativa
+FORMATOS_DATA = [
+    "%Y-%m-%d %H:%M:%S.%f",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%d %H:%M",
+    "%d/%m/%Y %H:%M:%S",
+    "%d/%m/%Y %H:%M",
+]
+
+
+def detect_date_format(valor: str) -> str | None:
+    # Descobre o formato da data a partir de uma amostra (primeira linha de dados)
+    for fmt in FORMATOS_DATA:
+        try:
+            datetime.strptime(valor.strip(), fmt)
+            return fmt
+        except ValueError:
+            continue
+    return None
+
+
+def read_header(caminho: str, skiprows: int) -> tuple[list[str], str]:
+    # Retorna os nomes das colunas e o primeiro campo da primeira linha de dados
+    with open(caminho, encoding=ENCODING) as f:
+        for _ in range(skiprows):
+            f.readline()
+        header = f.readline().rstrip("\r\n").split(SEP)
+        primeira = f.readline().split(SEP, 1)[0]
+    return header, primeira
+
+
+class Layout(NamedTuple):
+    # Estrutura de um export, detectada uma vez a partir do cabeçalho
+    nomes: list
+    usecols: list
+    dtcol: str
+    dtypes: dict
+    date_format: str | None
+
+
+def detect_layout(header: list[str], amostra: str) -> Layout:
+    # Descarta colunas sem nome (a coluna vazia no final da linha)
+    usecols = [i for i, c in enumerate(header) if c.strip()]
+    nomes = [header[i].strip() for i in usecols]
+    if not nomes or not amostra.strip():
+        raise ValueError("Arquivo vazio")
+
+    # Encontrar coluna de data/hora
+    dtcol = next((c for c in nomes if "Data" in c or "Hora" in c), None)
+    if dtcol is None:
+        raise ValueError("Coluna de data/hora não encontrada")
+
+    dtypes = {c: DTYPES.get(c, DTYPE_PADRAO) for c in nomes if c != dtcol}
+    dtypes[dtcol] = "str"
+    return Layout(nomes, usecols, dtcol, dtypes, detect_date_format(amostra))
+
+
+def parse_rows(fonte, layout: Layout, skiprows: int = 0) -> pd.DataFrame:
+    # Converte as linhas de dados (arquivo ou buffer) segundo o layout detectado
+    opcoes = dict(
+        sep=SEP, encoding=ENCODING, decimal=",", na_values=NA_VALUES,
+        skiprows=skiprows, header=None, names=layout.nomes, usecols=layout.usecols,
+    )
+    # Status (Int8) são lidos como float e convertidos depois: o leitor de
+    # CSV com inteiros anuláveis é ~2x mais lento
+    leitura = {c: DTYPE_PADRAO if t == "Int8" else t for c, t in layout.dtypes.items()}
+    try:
+        df = pd.read_csv(fonte, dtype=leitura, **opcoes)
+    except ValueError:
+        # Algum valor inesperado numa coluna numérica: lê como texto e converte
+        if hasattr(fonte, "seek"):
+            fonte.seek(0)
+        df = pd.read_csv(fonte, dtype=str, **opcoes)
+        for c in layout.dtypes:
+            if c != layout.dtcol:
+                texto = df[c].str.replace(",", ".", regex=False)
+                df[c] = pd.to_numeric(texto, errors="coerce").astype(leitura[c])
+    for c, t in layout.dtypes.items():
+        if t == "Int8":
+            df[c] = df[c].round().astype(t)
+
+    df = df.rename(columns={layout.dtcol: "DataHora"})
+    # Formato fixo detectado na primeira linha, sem inferência linha a linha
+    if layout.date_format is not None:
+        df["DataHora"] = pd.to_datetime(df["DataHora"], format=layout.date_format, errors="coerce")
+    else:
+        df["DataHora"] = pd.to_datetime(df["DataHora"], dayfirst=False, errors="coerce")
+
+    # Remover linhas com data inválida
+    return df.dropna(subset=["DataHora"]).reset_index(drop=True)
+
+
+def read_sdr_csv(caminho: str, skiprows: int = 0) -> pd.DataFrame:
+    # Lê um export do controlador já tipado, com coluna "DataHora" em datetime64
+    header, amostra = read_header(caminho, skiprows)
+    df = parse_rows(caminho, detect_layout(header, amostra), skiprows + 1)
+    if df.empty:
+        raise ValueError("Nenhuma data válida encontrada")
+    return df
+
+
+def write_sdr_csv(df: pd.DataFrame, caminho: str) -> None:
+    # Grava no formato do controlador (inclusive a coluna vazia no final), a
+    # partir de um frame com coluna "DataHora" ou indexado pela data/hora
+    saida = df.set_index("DataHora") if "DataHora" in df.columns else df.copy()
+    saida.index.name = "Data"
+    saida[" "] = ""
+    saida.to_csv(caminho, sep=SEP, decimal=",", na_rep=NA_VALUES[0],
+                 date_format="%Y-%m-%d %H:%M:%S.0", encoding=ENCODING)
@@ -0,0 +1,106 @@
+# Partição do conjunto de dados de uma loja por câmara (Origem).
+# Cada câmara vira uma ChamberSeries: instantes em int64 (ns) ordenados e um
+# array por coluna. Selecionar câmara + período é uma busca binária
+# (searchsorted) que devolve views dos mesmos arrays: nenhum rerun da página
+# copia as amostras. Arrays abertos do armazenamento colunar mapeado (ver
+# sdr.colstore) são usados como estão.
+import numpy as np
+import pandas as pd
+
+DIA_NS = pd.Timedelta(days=1).value
+
+
+class ChamberSeries:
+    # Série de uma câmara. tempo: int64 (ns) em ordem crescente; colunas:
+    # nome -> array do mesmo tamanho (numpy ou IntegerArray para Int8).
+    # Recortes (between, slice_days) são views; nada aqui escreve nos arrays.
+    __slots__ = ("tempo", "colunas", "mmap")
+
+    def __init__(self, tempo: np.ndarray, colunas: dict, mmap: bool = False):
+        self.tempo = tempo
+        self.colunas = colunas
+        self.mmap = mmap
+
+    def __len__(self) -> int:
+        return len(self.tempo)
+
+    @property
+    def empty(self) -> bool:
+        return len(self.tempo) == 0
+
+    @property
+    def index(self) -> pd.DatetimeIndex:
+        return pd.DatetimeIndex(self.tempo.view("datetime64[ns]"), name="DataHora", copy=False)
+
+    def between(self, inicio_ns: int, fim_ns: int) -> "ChamberSeries":
+        # Amostras com inicio_ns <= tempo < fim_ns (views)
+        a = int(np.searchsorted(self.tempo, inicio_ns, side="left"))
+        b = int(np.searchsorted(self.tempo, fim_ns, side="left"))
+        return ChamberSeries(self.tempo[a:b], {c: v[a:b] for c, v in self.colunas.items()}, self.mmap)
+
+    def slice_days(self, start_date, end_date) -> "ChamberSeries":
+        # Do início de start_date ao fim de end_date
+        inicio = pd.Timestamp(start_date).value
+        return self.between(inicio, pd.Timestamp(end_date).value + DIA_NS)
+
+    def series(self, nome: str) -> pd.Series:
+        # Coluna como Series indexada por DataHora, sem cópia
+        return pd.Series(self.colunas[nome], index=self.index, name=nome, copy=False)
+
+    def frame(self, colunas: list | None = None) -> pd.DataFrame:
+        # DataFrame indexado por DataHora sobre os mesmos arrays
+        nomes = [c for c in (self.colunas if colunas is None else colunas) if c in self.colunas]
+        return pd.DataFrame({c: self.series(c) for c in nomes}, index=self.index, copy=False)
+
+    def nbytes(self) -> int:
+        return self.tempo.nbytes + sum(v.nbytes for v in self.colunas.values())
+
+
+def _valores(serie: pd.Series):
+    # Array por trás da coluna, sem cópia
+    if isinstance(serie.dtype, pd.api.extensions.ExtensionDtype):
+        return serie.array
+    return serie.to_numpy(copy=False)
+
+
+def chamber_series(df: pd.DataFrame) -> ChamberSeries:
+    # df: frame com coluna "DataHora" ou já indexado por ela. Só ordena (e aí
+    # copia) se os instantes vierem fora de ordem.
+    if "DataHora" in df.columns:
+        df = df.set_index("DataHora")
+    tempo = df.index.asi8
+    colunas = {c: _valores(df[c]) for c in df.columns}
+    if len(tempo) > 1 and (np.diff(tempo) < 0).any():
+        ordem = np.argsort(tempo, kind="stable")
+        tempo = tempo[ordem]
+        colunas = {c: v[ordem] for c, v in colunas.items()}
+    return ChamberSeries(tempo, colunas, bool(df.attrs.get("mmap")))
+
+
+def build_partition(frames: dict) -> dict:
+    # frames: origem -> DataFrame com coluna "DataHora" ou já indexado por ela
+    return {nome: chamber_series(df) for nome, df in frames.items()}
+
+
+def data_range(partes: dict) -> tuple | None:
+    # (primeiro, último) instante entre todas as câmaras; None se não há amostras
+    limites = [(s.tempo[0], s.tempo[-1]) for s in partes.values() if len(s)]
+    if not limites:
+        return None
+    return pd.Timestamp(int(min(i for i, _ in limites))), pd.Timestamp(int(max(f for _, f in limites)))
+
+
+def slice_days(df: pd.DataFrame, start_date, end_date) -> pd.DataFrame:
+    # Fatia (view) de um frame indexado por tempo, do início de start_date ao
+    # fim de end_date; índice ordenado -> busca binária
+    inicio = df.index.searchsorted(pd.Timestamp(start_date), side="left")
+    fim = df.index.searchsorted(pd.Timestamp(end_date) + pd.Timedelta(days=1), side="left")
+    return df.iloc[inicio:fim]
+
+
+def select(partes: dict, origem, start_date, end_date) -> ChamberSeries:
+    # Recorte (views) da câmara no período; câmara desconhecida -> série vazia
+    serie = partes.get(origem)
+    if serie is None:
+        return ChamberSeries(np.empty(0, dtype=np.int64), {})
+    return serie.slice_days(start_date, end_date)
@@ -0,0 +1,104 @@
+# Cálculos de performance de temperatura das câmaras.
+from datetime import timedelta
+import numpy as np
+import pandas as pd
+from sdr.schedule import HORARIO_PADRAO, period_names
+
+# Janela de recuperação após o início do degelo: amostras em (t0+45min, t0+75min]
+# são desconsideradas na performance de temperatura
+RECOVERY_START = timedelta(minutes=45)
+RECOVERY_END = timedelta(minutes=75)
+# (início, fim) da janela, como recebido por sdr.rollup e sdr.store
+RECOVERY_WINDOW = (RECOVERY_START, RECOVERY_END)
+
+SETPOINT = -20.0
+
+# Períodos do horário padrão; o código de cada amostra é a posição na lista
+# (lojas com horário próprio: sdr.schedule.period_names)
+PERIODOS = period_names(HORARIO_PADRAO)
+
+
+def recovery_mask(index: pd.DatetimeIndex, events, start: timedelta = RECOVERY_START,
+                  end: timedelta = RECOVERY_END) -> np.ndarray:
+    # Marca as amostras dentro da janela de recuperação de qualquer degelo.
+    # Cada evento vira um intervalo [lo, hi) de posições via searchsorted e os
+    # intervalos são somados num vetor de diferenças: O(linhas + eventos·log linhas)
+    n = len(index)
+    if n == 0 or len(events) == 0:
+        return np.zeros(n, dtype=bool)
+
+    ts = index.asi8
+    ordem = None
+    if not index.is_monotonic_increasing:
+        ordem = np.argsort(ts, kind="stable")
+        ts = ts[ordem]
+
+    t0 = pd.DatetimeIndex(events).asi8
+    lo = np.searchsorted(ts, t0 + pd.Timedelta(start).value, side="right")
+    hi = np.searchsorted(ts, t0 + pd.Timedelta(end).value, side="right")
+
+    dif = np.zeros(n + 1, dtype=np.int64)
+    np.add.at(dif, lo, 1)
+    np.add.at(dif, hi, -1)
+    mask = np.cumsum(dif[:-1]) > 0
+
+    if ordem is not None:
+        desordenada = np.empty(n, dtype=bool)
+        desordenada[ordem] = mask
+        mask = desordenada
+    return mask
+
+
+def recovery_key(janela: tuple = RECOVERY_WINDOW) -> str:
+    # Entra na assinatura dos rollups: mudar a janela os refaz
+    inicio, fim = (pd.Timedelta(t) for t in janela)
+    return f"{inicio.total_seconds() / 60:g}-{fim.total_seconds() / 60:g}min"
+
+
+def _somas_periodo(rollups: list, start_date, end_date, n_periodos: int) -> tuple:
+    # Soma das linhas diárias dos rollups no período, por código de período:
+    # (N, Soma, histograma acumulado do desvio). acumulado[p, k] = amostras
+    # com |T - setpoint| <= k décimos de K, então a % para qualquer tolerância
+    # é uma consulta por posição, sem voltar às amostras.
+    grupos = []
+    for rollup in rollups:
+        dias = rollup.index.get_level_values("Dia")
+        sel = rollup[(dias >= pd.Timestamp(start_date)) & (dias <= pd.Timestamp(end_date))]
+        colunas_desvio = [c for c in rollup.columns if c[0] == "d" and c[1:].isdigit()]
+        grupos.append(sel.groupby(level="Periodo")[["N", "Soma"] + colunas_desvio].sum())
+    soma = pd.concat(grupos).groupby(level=0).sum() if len(grupos) > 1 else grupos[0]
+    soma = soma.reindex(range(n_periodos), fill_value=0)
+    return (soma["N"].to_numpy(), soma["Soma"].to_numpy(),
+            np.cumsum(soma.iloc[:, 2:].to_numpy(), axis=1))
+
+
+def performance_table(rollup: pd.DataFrame, start_date, end_date, delta: float,
+                      periodos: list = PERIODOS) -> pd.DataFrame:
+    # Média e % de amostras dentro de setpoint ± delta por período, somando as
+    # linhas diárias do rollup (ver sdr.rollup) em vez de varrer as amostras.
+    # periodos: nome de cada código de período (horário da loja).
+    n, soma, acumulado = _somas_periodo([rollup], start_date, end_date, len(periodos))
+    # Desvio guardado em décimos de K (as leituras têm 0,1 K de resolução):
+    # |desvio| <= delta são as faixas 0 .. floor(delta*10). O 1e-9 absorve o
+    # erro de ponto flutuante de valores como 0,3*10.
+    faixa = min(int(np.floor(delta * 10 + 1e-9)), acumulado.shape[1] - 1)
+
+    # Período sem amostra válida: "N/A"
+    com_dados = n > 0
+    media = np.round(soma / np.where(com_dados, n, 1), 1)
+    perf = np.round(acumulado[:, faixa] / np.where(com_dados, n, 1) * 100, 1)
+    return pd.DataFrame({
+        "Média (°C)": np.where(com_dados, media.astype(object), "N/A"),
+        "Performance (%)": np.where(com_dados, perf.astype(object), "N/A"),
+    }, index=pd.Index(periodos, name="Período"))
+
+
+def tolerance_curve(rollups: list, start_date, end_date, periodos: list = PERIODOS) -> pd.DataFrame:
+    # % de amostras dentro de setpoint ± tolerância, de 0,0 a 10,0 K em passos
+    # de 0,1 K (as faixas do histograma), somando as câmaras de `rollups`.
+    # Índice: tolerância (K); uma coluna por período, NaN se não há amostras.
+    n, _, acumulado = _somas_periodo(rollups, start_date, end_date, len(periodos))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        perf = acumulado / n[:, None] * 100
+    tolerancias = pd.Index(np.round(np.arange(acumulado.shape[1]) / 10, 1), name="Tolerância (K)")
+    return pd.DataFrame(perf.T, index=tolerancias, columns=periodos)
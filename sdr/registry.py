@@ -0,0 +1,66 @@
+# Cadastro das lojas: cada pasta data/<loja>/ com um arquivo loja.json é uma
+# instalação, com as câmaras, os arquivos exportados, a potência de degelo e,
+# opcionalmente, o horário de funcionamento (ver sdr.schedule).
+#
+# {
+#     "nome": "Atacadão Bangu RJ",
+#     "horario": {"abertura": "08:00", "fechamento": "21:00", "dias": [0, 1, 2, 3, 4]},
+#     "camaras": [
+#         {"nome": "Cam Cong L1", "arquivo": "L1.csv", "potencia_kw": 16.05}
+#     ]
+# }
+import glob
+import json
+import os
+from sdr.schedule import parse_schedule
+
+DATA_DIR = "data"
+CONFIG_NAME = "loja.json"
+
+
+def _ler_config(caminho: str) -> dict:
+    with open(caminho, encoding="utf-8") as f:
+        config = json.load(f)
+    pasta = os.path.dirname(caminho)
+    camaras = config.get("camaras", [])
+    if "nome" not in config or not camaras:
+        raise ValueError(f"Cadastro incompleto: {caminho}")
+    try:
+        return {
+            "nome": config["nome"],
+            "pasta": pasta,
+            "arquivos": {c["nome"]: os.path.join(pasta, c["arquivo"]) for c in camaras},
+            "potencias": {c["nome"]: float(c["potencia_kw"]) for c in camaras},
+            "horario": parse_schedule(config.get("horario")),
+        }
+    except KeyError as e:
+        raise ValueError(f"Cadastro incompleto: {caminho} (falta {e} em uma câmara)") from e
+
+
+def registry_signature(data_dir: str = DATA_DIR) -> tuple:
+    # Muda quando algum loja.json aparece, some ou é alterado (tamanho + mtime);
+    # os feriados e o horário estão no próprio loja.json
+    estado = []
+    for caminho in sorted(glob.glob(os.path.join(data_dir, "*", CONFIG_NAME))):
+        try:
+            info = os.stat(caminho)
+        except OSError:
+            continue
+        estado.append((caminho, info.st_size, info.st_mtime_ns))
+    return tuple(estado)
+
+
+def load_registry(data_dir: str = DATA_DIR) -> tuple[dict, dict]:
+    # Retorna (lojas, erros). lojas: nome da loja -> {"nome", "pasta",
+    # "arquivos", "potencias", "horario"}, em ordem alfabética. Um loja.json
+    # ilegível ou inválido não derruba as outras lojas: fica em erros
+    # (caminho do loja.json -> exceção), como em sdr.ingest.load_files.
+    lojas, erros = {}, {}
+    for caminho in sorted(glob.glob(os.path.join(data_dir, "*", CONFIG_NAME))):
+        try:
+            loja = _ler_config(caminho)
+        except (OSError, ValueError, TypeError, AttributeError) as e:
+            erros[caminho] = e
+            continue
+        lojas[loja["nome"]] = loja
+    return dict(sorted(lojas.items())), erros
@@ -0,0 +1,63 @@
+# Relatório de fechamento: economia de degelo e performance de temperatura de
+# todas as câmaras de várias lojas num período, calculado pelos rollups diários.
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+import os
+import pandas as pd
+from sdr.ingest import load_files
+from sdr.metrics import efficiency_table
+from sdr.performance import RECOVERY_WINDOW, performance_table
+from sdr.rollup import load_rollup
+from sdr.schedule import HORARIO_PADRAO, Schedule, period_names
+
+
+def _periodo_dos_dados(rollups: dict) -> tuple:
+    dias = pd.DatetimeIndex([d for r in rollups.values() for d in r.index.get_level_values("Dia")])
+    return dias.min().date(), dias.max().date()
+
+
+def store_summary(loja: str, arquivos: dict, potencias: dict, start_date=None, end_date=None,
+                  delta: float = 2.0, horario: Schedule = HORARIO_PADRAO,
+                  recuperacao: tuple = RECOVERY_WINDOW) -> pd.DataFrame:
+    # Uma linha por câmara da loja. Sem período informado, usa todo o histórico.
+    existentes = {nome: c for nome, c in arquivos.items() if os.path.exists(c)}
+    rollups, erros = load_files(existentes, loader=partial(load_rollup, horario=horario, recuperacao=recuperacao))
+    if not rollups:
+        return pd.DataFrame({"Loja": [loja], "Erro": ["Nenhum arquivo foi carregado com sucesso."]})
+    if start_date is None or end_date is None:
+        inicio, fim = _periodo_dos_dados(rollups)
+        start_date, end_date = start_date or inicio, end_date or fim
+
+    tabela = efficiency_table(rollups, potencias, start_date, end_date).round(2)
+    tabela.insert(0, "Fim", end_date.isoformat())
+    tabela.insert(0, "Início", start_date.isoformat())
+    periodos = period_names(horario)
+    for origem, rollup in rollups.items():
+        perf = performance_table(rollup, start_date, end_date, delta, periodos)
+        for nome_p in periodos:
+            tabela.loc[origem, f"Média (°C) – {nome_p}"] = perf.loc[nome_p, "Média (°C)"]
+            tabela.loc[origem, f"Performance (%) – {nome_p}"] = perf.loc[nome_p, "Performance (%)"]
+    for origem in arquivos:
+        if origem not in existentes:
+            tabela.loc[origem, "Erro"] = f"Arquivo não encontrado: {arquivos[origem]}"
+        elif origem in erros:
+            tabela.loc[origem, "Erro"] = str(erros[origem])
+    tabela = tabela.reset_index().rename(columns={"Origem": "Câmara"})
+    tabela.insert(0, "Loja", loja)
+    return tabela
+
+
+def fleet_summary(registro: dict, start_date=None, end_date=None, delta: float = 2.0,
+                  workers: int | None = None, recuperacao: tuple = RECOVERY_WINDOW) -> pd.DataFrame:
+    # registro: lojas de sdr.registry.load_registry (ou um subconjunto delas).
+    # Cada loja é processada num processo separado.
+    if not registro:
+        return pd.DataFrame()
+    workers = workers or min(len(registro), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futuros = [
+            pool.submit(store_summary, nome, loja["arquivos"], loja["potencias"], start_date, end_date, delta,
+                        loja["horario"], recuperacao)
+            for nome, loja in registro.items()
+        ]
+        return pd.concat([f.result() for f in futuros], ignore_index=True)
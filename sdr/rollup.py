@@ -0,0 +1,98 @@
+# Resumo diário por câmara, calculado na ingestão e persistido ao lado do CSV.
+# Uma linha por (Dia, Periodo) — Periodo é o código int8 do horário da loja
+# (ver sdr.schedule) — com contagem de degelos e sua duração medida
+# (atribuídas ao início do degelo, ver sdr.events), minutos de compressor
+# ligado e as somas da temperatura fora da janela de recuperação, mais um
+# histograma do desvio |T - setpoint| em décimos de K (colunas
+# d0..d100). Consultas por período passam a somar poucas linhas por dia.
+import numpy as np
+import pandas as pd
+from sdr.events import EVENTS_VERSION, defrost_events, load_events, sample_step
+from sdr.ingest import cached_frame, load_file
+from sdr.performance import RECOVERY_WINDOW, SETPOINT, recovery_key, recovery_mask
+from sdr.schedule import HORARIO_PADRAO, Schedule, period_codes, schedule_key
+
+ROLLUP_SUFFIX = ".rollup.parquet"
+ROLLUP_VERSION = "2"
+# Histograma do desvio: 0,0 a 10,0 K em passos de 0,1 K (acima disso não entra)
+FAIXAS_DESVIO = 101
+COLUNAS_DESVIO = [f"d{i}" for i in range(FAIXAS_DESVIO)]
+
+
+def daily_rollup(df: pd.DataFrame, eventos: pd.DataFrame | None = None,
+                 setpoint: float = SETPOINT, horario: Schedule = HORARIO_PADRAO,
+                 recuperacao: tuple = RECOVERY_WINDOW) -> pd.DataFrame:
+    # df: frame de uma câmara com coluna "DataHora" (saída de load_file);
+    # eventos: índice de degelos do mesmo frame (calculado se não informado);
+    # recuperacao: janela pós-degelo (início, fim) fora da temperatura
+    if eventos is None:
+        eventos = defrost_events(df)
+    idx = pd.DatetimeIndex(df["DataHora"])
+    n = len(idx)
+    passo = sample_step(idx.to_numpy())
+
+    def coluna(nome):
+        if nome in df.columns:
+            return df[nome].to_numpy(dtype="float64")
+        return np.full(n, np.nan)
+
+    comp = np.nan_to_num(coluna("Comp"), nan=0.0)
+    recuperacao = recovery_mask(idx, eventos["Inicio"], *recuperacao)
+
+    # Falhas curtas já vêm preenchidas da grade (sdr.grid); o que continua
+    # ausente fica fora de N e do histograma, os denominadores da performance
+    temp = coluna("Temp ambiente")
+    valida = ~recuperacao & ~np.isnan(temp)
+    temp_v = np.where(valida, temp, 0.0)
+
+    base = pd.DataFrame({
+        "Dia": idx.normalize(),
+        "Periodo": period_codes(idx, horario),
+        "Amostras": 1,
+        "Comp_min": (comp == 1) * passo,
+        "N": valida.astype(np.int64),
+        "Soma": temp_v,
+        "Soma2": temp_v * temp_v,
+        "Min": np.where(valida, temp, np.nan),
+        "Max": np.where(valida, temp, np.nan),
+    })
+    grupos = base.groupby(["Dia", "Periodo"], sort=True)
+    rollup = grupos.agg(
+        Amostras=("Amostras", "sum"), Comp_min=("Comp_min", "sum"),
+        N=("N", "sum"), Soma=("Soma", "sum"), Soma2=("Soma2", "sum"),
+        Min=("Min", "min"), Max=("Max", "max"),
+    )
+
+    # Degelos e minutos de degelo medidos, atribuídos ao dia/período do início
+    inicio = pd.DatetimeIndex(eventos["Inicio"])
+    por_inicio = pd.DataFrame({
+        "Dia": inicio.normalize(),
+        "Periodo": period_codes(inicio, horario),
+        "Degelos": np.ones(len(inicio), dtype=np.int64),
+        "Degelo_min": eventos["Duracao_min"].to_numpy(),
+    }).groupby(["Dia", "Periodo"]).sum()
+    por_inicio = por_inicio.reindex(rollup.index, fill_value=0)
+    rollup.insert(1, "Degelos", por_inicio["Degelos"].astype(np.int64))
+    rollup.insert(2, "Degelo_min", por_inicio["Degelo_min"].astype("float64"))
+
+    # Histograma do desvio por grupo num único bincount (grupo × faixa)
+    gid = grupos.ngroup().to_numpy()
+    desvio = np.rint(np.abs(temp - setpoint) * 10)
+    conta = valida & (desvio < FAIXAS_DESVIO)
+    chave = gid[conta] * FAIXAS_DESVIO + desvio[conta].astype(np.int64)
+    hist = np.bincount(chave, minlength=len(rollup) * FAIXAS_DESVIO)
+    hist = hist.reshape(len(rollup), FAIXAS_DESVIO)
+    return pd.concat([rollup, pd.DataFrame(hist, index=rollup.index, columns=COLUNAS_DESVIO)], axis=1)
+
+
+def load_rollup(caminho: str, setpoint: float = SETPOINT, horario: Schedule = HORARIO_PADRAO,
+                recuperacao: tuple = RECOVERY_WINDOW) -> pd.DataFrame:
+    # Rollup do arquivo, do cache em disco quando o CSV, o horário, a janela
+    # de recuperação e a detecção de degelos não mudaram
+    chave = (f"rollup={ROLLUP_VERSION};events={EVENTS_VERSION};setpoint={setpoint};horario={schedule_key(horario)};"
+             f"recuperacao={recovery_key(recuperacao)}")
+    def construir():
+        return daily_rollup(load_file(caminho), load_events(caminho), setpoint, horario,
+                            recuperacao).reset_index()
+    df = cached_frame(caminho, ROLLUP_SUFFIX, construir, chave)
+    return df.set_index(["Dia", "Periodo"])
@@ -0,0 +1,87 @@
+# Horário de funcionamento da loja (campo "horario" do loja.json) e o código
+# de período de cada amostra: 0 = operação, 1 = fora do horário, 2 = dia sem
+# operação (fim de semana ou feriado). O código é calculado uma vez, na
+# ingestão (ver sdr.rollup); as consultas só agrupam por ele.
+#
+#   "horario": {"abertura": "07:00", "fechamento": "22:00",
+#               "dias": [0, 1, 2, 3, 4, 5], "feriados": ["2025-09-07"]}
+#
+# Campos ausentes ficam com o padrão (08–21h, segunda a sexta, sem feriados).
+# Fechamento antes da abertura = operação atravessa a meia-noite.
+import json
+from typing import NamedTuple
+import numpy as np
+import pandas as pd
+
+MINUTO_NS = pd.Timedelta(minutes=1).value
+DIA_NS = pd.Timedelta(days=1).value
+MINUTOS_DIA = 24 * 60
+
+
+class Schedule(NamedTuple):
+    abertura: int     # minuto do dia em que a operação começa
+    fechamento: int   # minuto do dia em que termina
+    dias: tuple       # dias da semana com operação (0 = segunda)
+    feriados: tuple   # datas (AAAA-MM-DD) sem operação
+
+
+HORARIO_PADRAO = Schedule(8 * 60, 21 * 60, (0, 1, 2, 3, 4), ())
+
+
+def _minuto(valor: str) -> int:
+    hora, _, minuto = str(valor).partition(":")
+    total = int(hora) * 60 + int(minuto or 0)
+    if not 0 <= total <= MINUTOS_DIA:
+        raise ValueError(f"Horário inválido: {valor}")
+    return total
+
+
+def parse_schedule(config: dict | None) -> Schedule:
+    # config: campo "horario" do loja.json (ou None)
+    if not config:
+        return HORARIO_PADRAO
+    padrao = HORARIO_PADRAO
+    dias = tuple(sorted({int(d) for d in config.get("dias", padrao.dias)}))
+    if any(not 0 <= d <= 6 for d in dias):
+        raise ValueError(f"Dia da semana inválido: {dias}")
+    return Schedule(
+        abertura=_minuto(config["abertura"]) if "abertura" in config else padrao.abertura,
+        fechamento=_minuto(config["fechamento"]) if "fechamento" in config else padrao.fechamento,
+        dias=dias,
+        feriados=tuple(sorted(pd.Timestamp(d).date().isoformat() for d in config.get("feriados", ()))),
+    )
+
+
+def schedule_key(horario: Schedule) -> str:
+    # Entra na assinatura dos rollups e relatórios: mudar o horário os refaz
+    return json.dumps(list(horario), ensure_ascii=False)
+
+
+def _hora(minuto: int) -> str:
+    return f"{minuto // 60:02d}" if minuto % 60 == 0 else f"{minuto // 60:02d}:{minuto % 60:02d}"
+
+
+def period_names(horario: Schedule = HORARIO_PADRAO) -> list:
+    # Nome de cada código, na ordem
+    ab, fe = _hora(horario.abertura), _hora(horario.fechamento)
+    return [f"Operação ({ab}–{fe}h)", f"Fora ({fe}–{ab}h)",
+            "Fim de Semana e Feriados" if horario.feriados else "Fim de Semana"]
+
+
+def period_codes(tempo, horario: Schedule = HORARIO_PADRAO) -> np.ndarray:
+    # tempo: DatetimeIndex ou int64 (ns). Dia da semana e minuto do dia saem
+    # de aritmética inteira sobre os ns, sem decompor as datas.
+    ns = np.asarray(tempo.asi8 if isinstance(tempo, pd.DatetimeIndex) else tempo, dtype=np.int64)
+    dia = ns // DIA_NS
+    minuto = (ns - dia * DIA_NS) // MINUTO_NS
+    # 1970-01-01 foi uma quinta-feira (3)
+    semana = (dia + 3) % 7
+    util = np.isin(semana, horario.dias)
+    if horario.feriados:
+        feriados = np.array(horario.feriados, dtype="datetime64[D]").astype(np.int64)
+        util &= ~np.isin(dia, feriados)
+    if horario.abertura <= horario.fechamento:
+        operacao = (minuto >= horario.abertura) & (minuto < horario.fechamento)
+    else:
+        operacao = (minuto >= horario.abertura) | (minuto < horario.fechamento)
+    return np.where(util, np.where(operacao, 0, 1), 2).astype(np.int8)
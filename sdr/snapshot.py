@@ -0,0 +1,197 @@
+# Relatórios estáticos (HTML) das visões padrão de cada loja: eficiência
+# energética e análise por câmara da última semana e do último mês de dados.
+# Ficam em data/<loja>/snapshots/ e só são refeitos quando algum arquivo de
+# dados da loja muda; abrir um deles não exige nenhum processamento.
+# Cada página é autossuficiente: vega, vega-lite e vega-embed vão embutidos
+# (pacote do vl-convert, o mesmo de chart.save(..., inline=True) do Altair),
+# então os gráficos abrem sem internet e atrás de proxy.
+#
+#   python -m sdr.snapshot              # gera/atualiza as lojas cadastradas
+#   python -m sdr.snapshot --force --loja "Atacadão Bangu RJ"
+import argparse
+import html
+import json
+import os
+import sys
+import tempfile
+from datetime import timedelta
+from functools import lru_cache
+import altair as alt
+import numpy as np
+import pandas as pd
+import vl_convert as vlc
+from sdr.charts import barras_prev_real, grafico_temperatura_degelos
+from sdr.events import events_in_range
+from sdr.metrics import efficiency_table, efficiency_total
+from sdr.partition import select
+from sdr.performance import RECOVERY_WINDOW, performance_table, recovery_key
+from sdr.registry import DATA_DIR, load_registry
+from sdr.schedule import period_names, schedule_key
+from sdr.store import StoreData, load_store
+
+# chave -> (rótulo, dias até o último dia com dados)
+PERIODOS_PADRAO = {
+    "ultima_semana": ("Última semana", 7),
+    "ultimo_mes": ("Último mês", 30),
+}
+SNAPSHOT_DIR = "snapshots"
+SNAPSHOT_VERSION = "4"
+DELTA_PADRAO = 2.0
+
+_PAGINA = """<!DOCTYPE html>
+<html lang="pt-BR"><head><meta charset="utf-8"><title>{titulo}</title>
+<script>{vega}</script>
+<style>
+body {{ font-family: sans-serif; margin: 2rem; color: #112D4E; }}
+table {{ border-collapse: collapse; margin: 0.5rem 0 1.5rem; }}
+th, td {{ border: 1px solid #E8E8E8; padding: 0.3rem 0.7rem; text-align: right; }}
+hr {{ border: 0; border-top: 1px solid #E8E8E8; margin: 2rem 0; }}
+</style></head><body>
+{corpo}
+</body></html>
+"""
+
+
+@lru_cache(maxsize=1)
+def _vega_js() -> str:
+    # vega + vega-lite (versão do Altair instalado) + vega-embed num script só
+    versao = "_".join(alt.SCHEMA_VERSION.lstrip("v").split(".")[:2])
+    return vlc.javascript_bundle(vl_version=versao)
+
+
+def _grafico(chart, n: int) -> str:
+    spec = chart.properties(width=900).to_json(indent=None)
+    return f'<div id="g{n}"></div><script>vegaEmbed("#g{n}", {spec}, {{"actions": false}});</script>'
+
+
+def render_store(loja: str, potencias: dict, dados: StoreData, start_date, end_date,
+                 delta: float = DELTA_PADRAO) -> str:
+    # Página com a mesma informação dos modos "Eficiência Energética" e
+    # "Análise por ambiente" do dashboard, para o período informado
+    e = html.escape
+    partes = [f"<h1>Plotter Racks - Análise SDR - {e(loja)}</h1>",
+              f"<p>Período: {start_date:%d/%m/%Y} a {end_date:%d/%m/%Y} • Delta tolerância: {delta:.1f} K</p>"]
+    n = 0
+
+    tabela = efficiency_table(dados.rollups, potencias, start_date, end_date)
+    total = efficiency_total(tabela)
+    partes.append("<h2>Total - Eficiência Energética</h2>")
+    df_tot = pd.DataFrame([{"Sistema": "Total", "Previsto": total["Previsto"], "Real": total["Real"]}])
+    partes.append(_grafico(barras_prev_real(df_tot).properties(height=300).configure_view(strokeOpacity=0), n))
+    n += 1
+    partes.append(f"<p>Economia: <b>{total['Economia (%)']:.1f}%</b> • Prev: {total['Previsto']:.1f} kWh "
+                  f"Real: {total['Real']:.1f} kWh • Degelos agendados: <b>{int(total['Ciclos'])}</b> "
+                  f"• Degelos realizados: <b>{int(total['Eventos'])}</b></p>")
+    partes.append(tabela.round(1).to_html())
+
+    for origem in potencias:
+        partes.append(f"<hr><h2>Análise – {e(str(origem))}</h2>")
+        serie = select(dados.partes, origem, start_date, end_date)
+        if serie.empty or "Temp ambiente" not in serie.colunas:
+            partes.append("<p>Nenhum dado encontrado no período selecionado.</p>")
+            continue
+        eventos = events_in_range(dados.eventos[origem], start_date, end_date)
+        if not np.isnan(serie.colunas["Temp ambiente"]).all():
+            partes.append("<h3>Temperatura e Eventos de Degelo</h3>")
+            grafico = grafico_temperatura_degelos(serie, dados.piramides.get(origem), eventos, start_date, end_date)
+            partes.append(_grafico(grafico, n))
+            n += 1
+        partes.append("<h3>Performance de Temperatura da Câmara</h3>")
+        partes.append(performance_table(dados.rollups[origem], start_date, end_date, delta,
+                                        period_names(dados.horario)).to_html())
+    return _PAGINA.format(titulo=e(f"Análise SDR - {loja}"), vega=_vega_js(), corpo="\n".join(partes))
+
+
+def _assinatura(cadastro: dict, delta: float, recuperacao: tuple) -> str:
+    # Muda quando qualquer arquivo da loja muda (tamanho/mtime) ou o
+    # formato/delta/horário/janela de recuperação, e quando o cadastro muda o
+    # que a página mostra (nome, potências de degelo)
+    estado = []
+    for nome, caminho in sorted(cadastro["arquivos"].items()):
+        if os.path.exists(caminho):
+            info = os.stat(caminho)
+            estado.append([nome, caminho, info.st_size, info.st_mtime_ns])
+    return json.dumps([SNAPSHOT_VERSION, cadastro["nome"], sorted(cadastro["potencias"].items()), delta,
+                       schedule_key(cadastro["horario"]), recovery_key(recuperacao), estado], ensure_ascii=False)
+
+
+def snapshot_dir(cadastro: dict) -> str:
+    return os.path.join(cadastro["pasta"], SNAPSHOT_DIR)
+
+
+def ensure_snapshots(cadastro: dict, delta: float = DELTA_PADRAO, force: bool = False,
+                     recuperacao: tuple = RECOVERY_WINDOW) -> dict:
+    # Garante os relatórios padrão atualizados da loja (entrada de load_registry).
+    # Retorna chave do período -> caminho do HTML.
+    pasta = snapshot_dir(cadastro)
+    indice_path = os.path.join(pasta, "index.json")
+    caminhos = {chave: os.path.join(pasta, f"{chave}.html") for chave in PERIODOS_PADRAO}
+    assinatura = _assinatura(cadastro, delta, recuperacao)
+
+    if not force and all(os.path.exists(c) for c in caminhos.values()):
+        indice = _ler_indice(indice_path)
+        if indice is not None and indice.get("assinatura") == assinatura:
+            return caminhos
+
+    existentes = {nome: c for nome, c in cadastro["arquivos"].items() if os.path.exists(c)}
+    dados, _ = load_store(existentes, horario=cadastro["horario"], recuperacao=recuperacao)
+    if dados is None:
+        return {}
+    os.makedirs(pasta, exist_ok=True)
+    fim = dados.periodo[1].date()
+    periodos = {}
+    for chave, (rotulo, dias) in PERIODOS_PADRAO.items():
+        inicio = max(fim - timedelta(days=dias - 1), dados.periodo[0].date())
+        pagina = render_store(cadastro["nome"], cadastro["potencias"], dados, inicio, fim, delta)
+        _gravar_texto(caminhos[chave], pagina)
+        periodos[chave] = {"rotulo": rotulo, "inicio": inicio.isoformat(), "fim": fim.isoformat()}
+    # Índice por último: até ele mudar, a assinatura velha faz a próxima sessão refazer
+    _gravar_texto(indice_path, json.dumps({"assinatura": assinatura, "periodos": periodos},
+                                          ensure_ascii=False, indent=2))
+    return caminhos
+
+
+def _ler_indice(caminho: str) -> dict | None:
+    # Índice ausente ou ilegível conta como relatório velho
+    try:
+        with open(caminho, encoding="utf-8") as f:
+            indice = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return indice if isinstance(indice, dict) else None
+
+
+def _gravar_texto(caminho: str, texto: str) -> None:
+    # Arquivo temporário único + troca atômica: outra sessão abrindo o
+    # relatório nunca lê uma página ou um índice pela metade
+    fd, tmp = tempfile.mkstemp(prefix=f"{os.path.basename(caminho)}.", suffix=".tmp",
+                               dir=os.path.dirname(os.path.abspath(caminho)))
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(texto)
+        os.replace(tmp, caminho)
+    except Exception:
+        os.remove(tmp)
+        raise
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m sdr.snapshot", description="Gera os relatórios estáticos das lojas")
+    parser.add_argument("--data-dir", default=DATA_DIR, help="pasta com data/<loja>/loja.json (padrão: data)")
+    parser.add_argument("--loja", action="append", help="limita às lojas informadas (pode repetir)")
+    parser.add_argument("--force", action="store_true", help="refaz mesmo sem mudança nos dados")
+    args = parser.parse_args(argv)
+
+    registro, erros = load_registry(args.data_dir)
+    for caminho, e in erros.items():
+        print(f"Cadastro ignorado ({caminho}): {e}", file=sys.stderr)
+    for nome in args.loja or list(registro):
+        if nome not in registro:
+            parser.error(f"loja não cadastrada: {nome}")
+        for chave, caminho in ensure_snapshots(registro[nome], force=args.force).items():
+            print(f"{nome} • {PERIODOS_PADRAO[chave][0]}: {caminho}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+# Dados carregados de uma loja, prontos para o dashboard e para o modo batch.
+from functools import partial
+from typing import NamedTuple
+import pandas as pd
+from sdr.colstore import load_columns
+from sdr.events import defrost_events, load_events
+from sdr.grid import gap_index
+from sdr.ingest import load_files, load_gaps
+from sdr.lod import build_pyramid
+from sdr.memcache import FileCache, file_signature, nbytes
+from sdr.partition import build_partition, data_range
+from sdr.performance import RECOVERY_WINDOW, recovery_key
+from sdr.rollup import daily_rollup, load_rollup
+from sdr.schedule import HORARIO_PADRAO, Schedule, schedule_key
+
+
+# Colunas mantidas em memória para as análises (gráfico, eventos, rollups);
+# os demais canais do controlador continuam no cache Parquet
+COLUNAS_ANALISE = ["Temp ambiente", "Comp", "Degelo"]
+
+
+class StoreData(NamedTuple):
+    partes: dict           # origem -> ChamberSeries da câmara (ver sdr.partition)
+    rollups: dict          # origem -> resumo diário (ver sdr.rollup)
+    eventos: dict          # origem -> índice de degelos (ver sdr.events)
+    piramides: dict        # origem -> pirâmide de temperatura (ver sdr.lod)
+    periodo: tuple | None  # (primeiro, último) instante com dados, ou None
+    lacunas: dict          # origem -> índice de falhas (ver sdr.grid)
+    horario: Schedule      # horário da loja usado nos códigos de período (ver sdr.schedule)
+
+
+def build_store(frames: dict, rollups: dict | None = None, eventos: dict | None = None,
+                lacunas: dict | None = None, horario: Schedule = HORARIO_PADRAO,
+                recuperacao: tuple = RECOVERY_WINDOW) -> StoreData:
+    # frames: origem -> DataFrame com coluna "DataHora" ou já indexado por ela
+    # (armazenamento colunar mapeado). Sem rollups/eventos/falhas prontos
+    # (modo ao vivo), calcula-os a partir dos próprios frames.
+    if lacunas is None:
+        # Frames já preenchidos: ficam só as falhas que a política não cobriu
+        lacunas = {nome: gap_index(df if "DataHora" in df.columns else df.reset_index())
+                   for nome, df in frames.items()}
+    if eventos is None:
+        eventos = {nome: defrost_events(df) for nome, df in frames.items()}
+    if rollups is None:
+        rollups = {nome: daily_rollup(df, eventos[nome], horario=horario, recuperacao=recuperacao) for nome, df in frames.items()}
+    partes = build_partition({nome: _projetar(df) for nome, df in frames.items()})
+    piramides = {nome: build_pyramid(serie.series("Temp ambiente")) for nome, serie in partes.items()
+                 if "Temp ambiente" in serie.colunas}
+    return StoreData(partes, rollups, eventos, piramides, data_range(partes), lacunas, horario)
+
+
+def _projetar(df: pd.DataFrame) -> pd.DataFrame:
+    # Só as colunas de análise; frame que já está assim passa sem cópia
+    colunas = [c for c in df.columns if c == "DataHora" or c in COLUNAS_ANALISE]
+    return df if len(colunas) == len(df.columns) else df[colunas]
+
+
+def store_nbytes(dados: StoreData) -> int:
+    return (nbytes(dados.partes) + nbytes(dados.rollups) + nbytes(dados.eventos) + nbytes(dados.piramides)
+            + nbytes(dados.lacunas))
+
+
+def memory_report(dados: StoreData) -> pd.DataFrame:
+    # Memória ocupada por componente da loja, em MB; "Amostras (mmap)" são
+    # páginas compartilhadas entre processos e não entram no total
+    mapeadas = sum(serie.nbytes() for serie in dados.partes.values() if serie.mmap)
+    componentes = {
+        "Amostras": nbytes(dados.partes),
+        "Rollups": nbytes(dados.rollups),
+        "Eventos": nbytes(dados.eventos),
+        "Pirâmides": nbytes(dados.piramides),
+        "Falhas": nbytes(dados.lacunas),
+    }
+    linhas = {nome: valor / 2**20 for nome, valor in componentes.items()}
+    linhas["Total"] = sum(linhas.values())
+    linhas["Amostras (mmap)"] = mapeadas / 2**20
+    return pd.Series(linhas, name="MB").round(2).to_frame()
+
+
+def store_signature(paths: dict, horario: Schedule = HORARIO_PADRAO,
+                    recuperacao: tuple = RECOVERY_WINDOW) -> tuple | None:
+    # Identifica o conteúdo da loja que load_store monta (arquivos com tamanho
+    # + mtime, horário e janela) sem guardar a loja; None se algum arquivo
+    # não pôde ser lido
+    try:
+        arquivos = tuple((nome, caminho, file_signature(caminho)) for nome, caminho in paths.items())
+    except OSError:
+        return None
+    return arquivos, schedule_key(horario), recovery_key(recuperacao)
+
+
+def load_store(paths: dict, cache: FileCache | None = None, horario: Schedule = HORARIO_PADRAO,
+               recuperacao: tuple = RECOVERY_WINDOW) -> tuple[StoreData | None, dict]:
+    # Abre todas as câmaras em paralelo (armazenamento colunar mapeado) com
+    # eventos e rollups persistidos.
+    # Com `cache`, a loja montada e cada arquivo ficam em memória, validados por
+    # tamanho + mtime: só arquivos novos ou alterados são lidos de novo.
+    # Retorna (dados, erros); dados é None se nenhum arquivo pôde ser lido.
+    carregar_rollup = partial(load_rollup, horario=horario, recuperacao=recuperacao)
+    if cache is None:
+        frame, evento, rollup, lacuna = _amostras, load_events, carregar_rollup, load_gaps
+    else:
+        chave = ("loja", tuple(paths.items()), horario, recovery_key(recuperacao))
+        try:
+            assinatura = tuple(file_signature(c) for c in paths.values())
+        except OSError:
+            assinatura = None
+        dados = cache.get(chave, assinatura) if assinatura is not None else None
+        if dados is not None:
+            return dados, {}
+        frame = partial(_por_arquivo, cache, "frame", _amostras)
+        evento = partial(_por_arquivo, cache, "eventos", load_events)
+        rollup = partial(_por_arquivo, cache, f"rollup:{schedule_key(horario)};{recovery_key(recuperacao)}", carregar_rollup)
+        lacuna = partial(_por_arquivo, cache, "lacunas", load_gaps)
+
+    frames, erros = load_files(paths, loader=frame)
+    if not frames:
+        return None, erros
+    carregados = {nome: paths[nome] for nome in frames}
+    eventos, erros_eventos = load_files(carregados, loader=evento)
+    rollups, erros_rollups = load_files(carregados, loader=rollup)
+    lacunas, erros_lacunas = load_files(carregados, loader=lacuna)
+    # Câmara com eventos, rollup ou falhas ilegíveis sai da loja inteira: as
+    # análises esperam as quatro partes para cada câmara de `partes`
+    for falhas in (erros_eventos, erros_rollups, erros_lacunas):
+        for nome, e in falhas.items():
+            erros.setdefault(nome, e)
+    frames = {nome: df for nome, df in frames.items() if nome not in erros}
+    if not frames:
+        return None, erros
+    eventos, rollups, lacunas = ({nome: d[nome] for nome in frames} for d in (eventos, rollups, lacunas))
+    dados = build_store(frames, rollups, eventos, lacunas, horario, recuperacao)
+    # Loja com arquivo faltando/ilegível não vai para o cache: o erro reaparece
+    if cache is not None and not erros and assinatura is not None:
+        cache.put(chave, assinatura, dados, store_nbytes(dados))
+    return dados, erros
+
+
+def _amostras(caminho: str) -> pd.DataFrame:
+    # Colunas de análise abertas do armazenamento colunar mapeado (sem cópia)
+    return load_columns(caminho, COLUNAS_ANALISE)
+
+
+def _por_arquivo(cache: FileCache, tipo: str, loader, caminho: str):
+    return cache.get_or_load(caminho, tipo, loader)
@@ -0,0 +1,92 @@
+# Tempo gasto em cada etapa de uma execução da página (ou de qualquer rotina
+# com etapas). Cada etapa vira uma linha JSON no log (SDR_TIMING_LOG, padrão
+# logs/sdr_timing.jsonl) assim que termina, então execuções interrompidas
+# por st.stop() também ficam registradas. Para agregar entre sessões e lojas:
+#
+#   pd.read_json("logs/sdr_timing.jsonl", lines=True).groupby(["loja", "etapa"])["ms"].describe()
+#
+# SDR_TIMING_LOG vazio desliga o log.
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+import pandas as pd
+
+LOG_PATH = os.environ.get("SDR_TIMING_LOG", os.path.join("logs", "sdr_timing.jsonl"))
+
+# Várias sessões (threads do servidor) escrevem no mesmo arquivo
+_lock = threading.Lock()
+
+
+class StageTimer:
+    # contexto: campos repetidos em toda linha do log (ex.: loja, sessão).
+    # ao_registrar: chamado com o próprio timer depois de cada etapa (ex.:
+    # atualizar o painel de depuração).
+
+    def __init__(self, contexto: dict | None = None, log_path: str | None = LOG_PATH):
+        self.contexto = dict(contexto or {})
+        self.execucao = uuid.uuid4().hex[:12]
+        self.etapas = []
+        self.log_path = log_path
+        self.ao_registrar = None
+        self._inicio = time.perf_counter()
+
+    @contextmanager
+    def stage(self, nome: str, **extra):
+        # Mede o bloco; o dict devolvido aceita campos extras durante a etapa
+        # (ex.: bytes do gráfico, acertos de cache)
+        info = dict(extra)
+        t0 = time.perf_counter()
+        try:
+            yield info
+        finally:
+            self.record(nome, (time.perf_counter() - t0) * 1000, **info)
+
+    def record(self, nome: str, ms: float, **extra) -> None:
+        # Etapa medida fora do timer (ex.: dentro de um processo do pool)
+        etapa = {"etapa": nome, "ms": round(ms, 2), **extra}
+        self.etapas.append(etapa)
+        self._gravar(etapa)
+        if self.ao_registrar is not None:
+            self.ao_registrar(self)
+
+    def child(self, **contexto) -> "StageTimer":
+        # Timer de uma execução parcial (ex.: rerun de um fragmento), com o
+        # mesmo contexto e o mesmo destino
+        filho = StageTimer({**self.contexto, **contexto}, self.log_path)
+        filho.ao_registrar = self.ao_registrar
+        return filho
+
+    def total_ms(self) -> float:
+        return (time.perf_counter() - self._inicio) * 1000
+
+    def table(self) -> pd.DataFrame:
+        # Uma linha por etapa, na ordem; extras viram colunas
+        if not self.etapas:
+            return pd.DataFrame(columns=["etapa", "ms"])
+        return pd.DataFrame(self.etapas).set_index("etapa")
+
+    def _gravar(self, etapa: dict) -> None:
+        if not self.log_path:
+            return
+        linha = {"ts": datetime.now().isoformat(timespec="milliseconds"), "execucao": self.execucao,
+                 **self.contexto, **etapa}
+        texto = json.dumps(linha, ensure_ascii=False, default=str) + "\n"
+        try:
+            with _lock:
+                pasta = os.path.dirname(self.log_path)
+                if pasta:
+                    os.makedirs(pasta, exist_ok=True)
+                with open(self.log_path, "a", encoding="utf-8") as f:
+                    f.write(texto)
+        except OSError:
+            # Sem permissão de escrita: a página segue, só sem o log
+            self.log_path = None
+
+
+def cache_delta(antes: dict, depois: dict) -> dict:
+    # Acertos/faltas/descartes do FileCache entre duas leituras de stats()
+    return {chave: depois[chave] - antes[chave] for chave in ("hits", "misses", "evictions")}
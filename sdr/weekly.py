@@ -0,0 +1,227 @@
+# Exports semanais dos controladores (data/auxiliar): um arquivo por câmara e
+# semana, às vezes com um preâmbulo antes do cabeçalho:
+#
+#   L1_SDR;;;...                               tag do controlador
+#   01/09/2025 00:00;08/09/2025 00:00;;...     período exportado
+#   12061 Atacadão Bangu;;;...                 loja
+#   elielton.polityto;;;...                    usuário que exportou
+#    ;CPCO 11 - ... - CC01;CPCO 11 - ...;...   dispositivo de cada coluna
+#    ;Temp ambiente;Comp;Degelo;...            cabeçalho (data sem nome)
+#
+# Semanas consecutivas podem se sobrepor. stitch_directory junta os arquivos
+# de cada câmara numa série contínua, sem instantes repetidos, e guarda o
+# resultado (Parquet + manifesto) na própria pasta: semanas novas são
+# mescladas à série já montada, sem reler as antigas.
+#
+#   python -m sdr.weekly data/auxiliar
+#   python -m sdr.weekly data/auxiliar --csv-dir data/atacadao_bangu_RJ
+import argparse
+import glob
+import json
+import os
+import re
+import sys
+import tempfile
+from typing import NamedTuple
+import numpy as np
+import pandas as pd
+from sdr.parser import ENCODING, SEP, detect_date_format, detect_layout, parse_rows, write_sdr_csv
+
+# Versão do formato da série montada: incrementar quando a leitura mudar
+STITCH_VERSION = "1"
+STITCH_SUFFIX = ".stitched.parquet"
+MANIFEST_SUFFIX = ".stitched.json"
+# Câmara = prefixo do nome do arquivo ("L1A01_cam_..." e "L1_SDR_..." -> "L1")
+PREFIXO_CAMARA = re.compile(r"^([A-Za-z]+\d+)")
+# Linhas examinadas à procura do cabeçalho
+MAX_PREAMBULO = 20
+
+
+class WeeklyMeta(NamedTuple):
+    tag: str | None             # ex.: "L1_SDR"
+    inicio: pd.Timestamp | None
+    fim: pd.Timestamp | None
+    loja: str | None            # ex.: "12061 Atacadão Bangu"
+    usuario: str | None
+    dispositivos: list          # dispositivo de cada coluna de medida
+
+
+def chamber_key(caminho: str) -> str | None:
+    achado = PREFIXO_CAMARA.match(os.path.basename(caminho))
+    return achado.group(1) if achado else None
+
+
+def _data(valor: str) -> pd.Timestamp | None:
+    fmt = detect_date_format(valor) if valor.strip() else None
+    return pd.to_datetime(valor.strip(), format=fmt) if fmt else None
+
+
+def read_preamble(caminho: str) -> tuple[WeeklyMeta, int]:
+    # Retorna os metadados e o número de linhas antes do cabeçalho. O
+    # cabeçalho é a linha seguida por linhas de dados (começam com data); a
+    # linha do período também começa com data, mas a seguinte não.
+    with open(caminho, encoding=ENCODING) as f:
+        linhas = [f.readline().rstrip("\r\n") for _ in range(MAX_PREAMBULO + 3)]
+
+    def dados(linha):
+        return detect_date_format(linha.split(SEP, 1)[0]) is not None
+
+    cabecalho = next((i for i in range(MAX_PREAMBULO + 1)
+                      if dados(linhas[i + 1]) and (dados(linhas[i + 2]) or not linhas[i + 2])), None)
+    if cabecalho is None:
+        raise ValueError("Cabeçalho não encontrado")
+
+    campos = [linha.split(SEP) for linha in linhas[:cabecalho]]
+
+    def campo(i, j=0):
+        valor = campos[i][j].strip() if i < len(campos) and j < len(campos[i]) else ""
+        return valor or None
+
+    periodo = campos[1] if len(campos) > 1 else []
+    meta = WeeklyMeta(
+        tag=campo(0),
+        inicio=_data(periodo[0]) if len(periodo) > 0 else None,
+        fim=_data(periodo[1]) if len(periodo) > 1 else None,
+        loja=campo(2),
+        usuario=campo(3),
+        dispositivos=[c.strip() for c in campos[4][1:] if c.strip()] if len(campos) > 4 else [],
+    )
+    return meta, cabecalho
+
+
+def read_weekly(caminho: str) -> tuple[WeeklyMeta, pd.DataFrame]:
+    # Lê um arquivo semanal (com ou sem preâmbulo) no formato de load_file,
+    # ordenado e sem instantes repetidos
+    meta, cabecalho = read_preamble(caminho)
+    with open(caminho, encoding=ENCODING) as f:
+        for _ in range(cabecalho):
+            f.readline()
+        header = f.readline().rstrip("\r\n").split(SEP)
+        amostra = f.readline().split(SEP, 1)[0]
+    # No formato com preâmbulo a coluna de data não tem nome
+    if not header[0].strip():
+        header[0] = "Data"
+    df = parse_rows(caminho, detect_layout(header, amostra), cabecalho + 1)
+    df = df.sort_values("DataHora", kind="stable")
+    df = df[~df["DataHora"].duplicated(keep="last")].reset_index(drop=True)
+    return meta, df
+
+
+def merge_sorted(base: pd.DataFrame, novo: pd.DataFrame) -> pd.DataFrame:
+    # Junta duas séries ordenadas por DataHora; nos instantes presentes nas
+    # duas vale `novo`. Só a janela de sobreposição é reordenada: o restante
+    # de `base` entra como está.
+    if base is None or base.empty:
+        return novo
+    if novo.empty:
+        return base
+    tempos = base["DataHora"].to_numpy()
+    a = np.searchsorted(tempos, novo["DataHora"].iloc[0].to_datetime64(), side="left")
+    b = np.searchsorted(tempos, novo["DataHora"].iloc[-1].to_datetime64(), side="right")
+    if a == b:
+        partes = [base.iloc[:a], novo, base.iloc[b:]]
+    else:
+        meio = pd.concat([base.iloc[a:b], novo], ignore_index=True).sort_values("DataHora", kind="stable")
+        meio = meio[~meio["DataHora"].duplicated(keep="last")]
+        partes = [base.iloc[:a], meio, base.iloc[b:]]
+    return pd.concat([p for p in partes if len(p)], ignore_index=True)
+
+
+def _estado(caminho: str) -> list:
+    info = os.stat(caminho)
+    return [info.st_size, info.st_mtime_ns]
+
+
+def _ler_manifesto(caminho: str) -> dict | None:
+    try:
+        with open(caminho, encoding="utf-8") as f:
+            manifesto = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return manifesto if manifesto.get("versao") == STITCH_VERSION else None
+
+
+def _gravar(df: pd.DataFrame, manifesto: dict, destino: str, manifesto_path: str) -> None:
+    # Série primeiro, manifesto depois (ambos por troca atômica): manifesto
+    # velho com série nova só causa uma remontagem
+    for caminho, gravar in ((destino, lambda tmp: df.to_parquet(tmp, index=False)),
+                            (manifesto_path, lambda tmp: _json(manifesto, tmp))):
+        fd, tmp = tempfile.mkstemp(prefix=f"{os.path.basename(caminho)}.", suffix=".tmp",
+                                   dir=os.path.dirname(os.path.abspath(caminho)))
+        os.close(fd)
+        try:
+            gravar(tmp)
+            os.replace(tmp, caminho)
+        except Exception:
+            os.remove(tmp)
+            raise
+
+
+def _json(dados: dict, caminho: str) -> None:
+    with open(caminho, "w", encoding="utf-8") as f:
+        json.dump(dados, f, ensure_ascii=False, indent=1)
+
+
+def stitch_chamber(pasta: str, chave: str, arquivos: list) -> tuple[pd.DataFrame, dict]:
+    # Série montada da câmara `chave` a partir de `arquivos`. Reaproveita a
+    # série gravada se os arquivos já mesclados não mudaram; senão remonta.
+    destino = os.path.join(pasta, chave + STITCH_SUFFIX)
+    manifesto_path = os.path.join(pasta, chave + MANIFEST_SUFFIX)
+    manifesto = _ler_manifesto(manifesto_path)
+    base = None
+    if manifesto is not None and os.path.exists(destino):
+        mesclados = manifesto["arquivos"]
+        atuais = {os.path.basename(c): c for c in arquivos}
+        if all(nome in atuais and _estado(atuais[nome]) == info["estado"] for nome, info in mesclados.items()):
+            base = pd.read_parquet(destino)
+    if base is None:
+        manifesto = {"versao": STITCH_VERSION, "camara": chave, "arquivos": {}}
+
+    novos = [c for c in arquivos if os.path.basename(c) not in manifesto["arquivos"]]
+    if not novos:
+        return base, manifesto
+    # Semanas mais recentes por último: na sobreposição vale a exportação mais nova
+    lidos = [(caminho, *read_weekly(caminho)) for caminho in novos]
+    lidos.sort(key=lambda x: x[2]["DataHora"].iloc[0] if len(x[2]) else pd.Timestamp.min)
+    for caminho, meta, df in lidos:
+        base = merge_sorted(base, df)
+        manifesto["arquivos"][os.path.basename(caminho)] = {
+            "estado": _estado(caminho),
+            "tag": meta.tag,
+            "loja": meta.loja,
+            "inicio": df["DataHora"].iloc[0].isoformat() if len(df) else None,
+            "fim": df["DataHora"].iloc[-1].isoformat() if len(df) else None,
+            "dispositivos": meta.dispositivos,
+        }
+    _gravar(base, manifesto, destino, manifesto_path)
+    return base, manifesto
+
+
+def stitch_directory(pasta: str) -> dict:
+    # Câmara -> (série montada, manifesto) para todos os CSVs semanais da pasta
+    grupos = {}
+    for caminho in sorted(glob.glob(os.path.join(pasta, "*.csv"))):
+        chave = chamber_key(caminho)
+        if chave is not None:
+            grupos.setdefault(chave, []).append(caminho)
+    return {chave: stitch_chamber(pasta, chave, arquivos) for chave, arquivos in grupos.items()}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m sdr.weekly",
+                                     description="Junta os exports semanais de cada câmara numa série contínua")
+    parser.add_argument("pasta", help="pasta com os CSVs semanais (ex.: data/auxiliar)")
+    parser.add_argument("--csv-dir", help="grava também <câmara>.csv no formato do controlador nesta pasta")
+    args = parser.parse_args(argv)
+
+    for chave, (df, manifesto) in stitch_directory(args.pasta).items():
+        lojas = sorted({info["loja"] for info in manifesto["arquivos"].values() if info["loja"]})
+        print(f"{chave}: {len(df)} amostras, {df['DataHora'].iloc[0]} a {df['DataHora'].iloc[-1]}, "
+              f"{len(manifesto['arquivos'])} arquivo(s){' – ' + ', '.join(lojas) if lojas else ''}")
+        if args.csv_dir:
+            write_sdr_csv(df, os.path.join(args.csv_dir, f"{chave}.csv"))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
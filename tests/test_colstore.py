@@ -0,0 +1,35 @@
+# Armazenamento colunar regravado por várias sessões ao mesmo tempo: todas
+# acabam com o diretório mapeado, sem erro nem volta ao frame em memória.
+import threading
+import pandas as pd
+from bench.synthetic import chamber_frame, write_csv
+from sdr import colstore
+from sdr.ingest import load_file
+
+
+def test_gravacoes_simultaneas(tmp_path, monkeypatch):
+    caminho = str(tmp_path / "L1.csv")
+    write_csv(chamber_frame("2025-01-01", 3, 0), caminho)
+    df = load_file(caminho)
+    destino = colstore.colstore_path(caminho)
+    esperado = df.sort_values("DataHora", kind="stable").set_index("DataHora")
+    erros, memoria = [], []
+    monkeypatch.setattr(colstore, "_em_memoria", lambda df, colunas: memoria.append(1))
+
+    def gravar():
+        for _ in range(15):
+            try:
+                colstore.write_columns(df, caminho, destino)
+                colstore.load_columns(caminho)
+            except Exception as e:
+                erros.append(e)
+
+    threads = [threading.Thread(target=gravar) for _ in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert erros == []
+    assert memoria == []
+    pd.testing.assert_frame_equal(colstore.open_columns(destino), esperado, check_freq=False)
+    assert [p.name for p in tmp_path.iterdir() if p.is_dir()] == ["L1.csv.cols"]
@@ -0,0 +1,49 @@
+# Degelos em séries com falhas longas: a falha no meio de um degelo (linhas
+# ausentes na grade) não cria um segundo início.
+import numpy as np
+import pandas as pd
+from sdr.events import defrost_events
+from sdr.grid import regularize
+
+
+def _bruto(degelo: list) -> pd.DataFrame:
+    n = len(degelo)
+    return pd.DataFrame({
+        "DataHora": pd.date_range("2025-01-01", periods=n, freq="5min"),
+        "Temp ambiente": np.where(np.array(degelo) == 1, -5.0, -20.0),
+        "Degelo": pd.array(degelo, dtype="Int8"),
+    })
+
+
+def test_falha_longa_no_meio_do_degelo():
+    completo = _bruto([0] * 10 + [1] * 20 + [0] * 10)
+    com_falha = completo.drop(completo.index[15:23])   # 8 linhas > FILL_POLICY
+    grade = regularize(com_falha)
+    assert grade["Degelo"].isna().sum() == 8
+    eventos = defrost_events(grade)
+    esperado = defrost_events(regularize(completo))
+    assert len(eventos) == 1
+    pd.testing.assert_series_equal(eventos["Inicio"], esperado["Inicio"])
+    pd.testing.assert_series_equal(eventos["Fim"], esperado["Fim"])
+    assert eventos["Amostras"].iloc[0] == 12
+
+
+def test_falha_no_fim_e_antes_do_inicio():
+    bruto = _bruto([0] * 10 + [1] * 6 + [0] * 10 + [1] * 6 + [0] * 5)
+    # Falhas longas logo depois do primeiro degelo e logo antes do segundo,
+    # com duas leituras fora de degelo entre elas
+    grade = regularize(bruto.drop(bruto.index[list(range(16, 20)) + list(range(22, 26))]))
+    eventos = defrost_events(grade)
+    inicio = pd.Timestamp("2025-01-01")
+    assert list(eventos["Inicio"]) == [inicio + pd.Timedelta(minutes=50), inicio + pd.Timedelta(minutes=130)]
+    # O primeiro termina na última amostra lida em degelo, não no fim da falha
+    assert eventos["Fim"].iloc[0] == inicio + pd.Timedelta(minutes=80)
+    assert list(eventos["Amostras"]) == [6, 6]
+
+
+def test_sem_falhas_igual_a_transicao():
+    rng = np.random.default_rng(0)
+    degelo = (rng.random(2000) > 0.9).astype(int).tolist()
+    eventos = defrost_events(_bruto(degelo))
+    ligado = np.array(degelo)
+    assert len(eventos) == int(((ligado[1:] == 1) & (ligado[:-1] == 0)).sum())
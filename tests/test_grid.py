@@ -0,0 +1,103 @@
+# Grade regular (to_grid), preenchimento das falhas curtas (fill_gaps) e
+# índice de falhas (gap_index), contra uma montagem linha a linha em casos
+# aleatórios e em casos pequenos escritos à mão.
+import numpy as np
+import pandas as pd
+import pytest
+from sdr.grid import fill_gaps, gap_index, to_grid
+
+INICIO = pd.Timestamp("2025-08-01")
+PASSO = pd.Timedelta(minutes=5)
+
+
+def _bruto(minutos, temp, degelo) -> pd.DataFrame:
+    return pd.DataFrame({
+        "DataHora": INICIO + pd.to_timedelta(np.asarray(minutos, dtype="float64"), unit="min"),
+        "Temp ambiente": np.asarray(temp, dtype="float32"),
+        "Degelo": pd.array(degelo, dtype="Int8"),
+    })
+
+
+def to_grid_loop(df: pd.DataFrame) -> pd.DataFrame:
+    # Referência: cada linha, na ordem do arquivo, escreve no ponto mais
+    # próximo da grade; a última escrita vence
+    passo = PASSO.value
+    pontos = {}
+    for linha in df.itertuples(index=False):
+        ns = linha.DataHora.value
+        pontos[(ns + passo // 2) // passo] = linha
+    primeiro, ultimo = min(pontos), max(pontos)
+    linhas = [pontos.get(p) for p in range(primeiro, ultimo + 1)]
+    return pd.DataFrame({
+        "DataHora": pd.to_datetime([p * passo for p in range(primeiro, ultimo + 1)]),
+        "Temp ambiente": np.array([np.nan if r is None else r[1] for r in linhas], dtype="float32"),
+        "Degelo": pd.array([None if r is None or pd.isna(r[2]) else r[2] for r in linhas], dtype="Int8"),
+    })
+
+
+@pytest.mark.parametrize("seed", range(100))
+def test_to_grid_igual_ao_laco(seed):
+    rng = np.random.default_rng(seed)
+    n = int(rng.integers(5, 300))
+    minutos = np.arange(n) * 5 + rng.uniform(-2.4, 2.4, n)
+    minutos = np.delete(minutos, rng.choice(n, n // 5, replace=False))          # linhas faltando
+    repetidas = rng.choice(len(minutos), len(minutos) // 10)
+    minutos = np.insert(minutos, repetidas, minutos[repetidas] + rng.uniform(-1, 1, len(repetidas)))
+    if seed % 2:
+        rng.shuffle(minutos)
+    temp = rng.normal(-20, 1, len(minutos)).round(1)
+    temp[rng.random(len(minutos)) < 0.05] = np.nan
+    degelo = [None if v < 0.05 else int(v > 0.8) for v in rng.random(len(minutos))]
+    df = _bruto(minutos, temp, degelo)
+    pd.testing.assert_frame_equal(to_grid(df, PASSO), to_grid_loop(df))
+
+
+def test_ponto_mais_proximo_e_ultima_linha():
+    df = _bruto([0.0, 4.9, 7.4, 10.0, 7.6], [1, 2, 3, 4, 5], [0, 0, 1, 1, 0])
+    grade = to_grid(df, PASSO)
+    assert list(grade["DataHora"]) == [INICIO + PASSO * i for i in range(3)]
+    # 4,9 e 7,4 min vão para 5 min; 10,0 e 7,6 para 10 min: vale a última do arquivo
+    assert grade["Temp ambiente"].tolist() == [1, 3, 5]
+    assert grade["Degelo"].tolist() == [0, 1, 0]
+
+
+def _grade(temp: list) -> pd.DataFrame:
+    n = len(temp)
+    return pd.DataFrame({
+        "DataHora": INICIO + PASSO * np.arange(n),
+        "Temp ambiente": np.array([np.nan if v is None else v for v in temp], dtype="float32"),
+        "Degelo": pd.array([None if v is None else 0 for v in temp], dtype="Int8"),
+    })
+
+
+def test_preenche_so_falhas_curtas():
+    # Falha de 3 amostras (limite da política) é preenchida; de 4 não; a
+    # falha do começo não tem valor anterior e fica
+    grade = _grade([None, 1.0, None, None, None, 2.0, None, None, None, None, 3.0])
+    cheia = fill_gaps(grade)
+    temp = cheia["Temp ambiente"].to_numpy()
+    assert temp[1:6].tolist() == [1, 1, 1, 1, 2]
+    assert np.isnan(temp[0]) and np.isnan(temp[6:10]).all()
+    assert cheia["Degelo"].isna().tolist() == [True] + [False] * 5 + [True] * 4 + [False]
+    # Política por coluna: 0 não preenche, None preenche tudo
+    assert fill_gaps(grade, {"Temp ambiente": 0})["Temp ambiente"].isna().sum() == 8
+    assert fill_gaps(grade, {"Temp ambiente": None})["Temp ambiente"].isna().sum() == 1
+
+
+def test_indice_de_falhas():
+    grade = _grade([None, 1.0, None, None, None, 2.0, None, None, None, None, 3.0])
+    # Linha com só uma medida ausente não é falha
+    grade.loc[1, "Degelo"] = pd.NA
+    falhas = gap_index(grade)
+    assert falhas["Inicio"].tolist() == [INICIO, INICIO + PASSO * 2, INICIO + PASSO * 6]
+    assert falhas["Fim"].tolist() == [INICIO + PASSO, INICIO + PASSO * 5, INICIO + PASSO * 10]
+    assert falhas["Amostras"].tolist() == [1, 3, 4]
+    assert falhas["Preenchida"].tolist() == [False, True, False]
+
+
+def test_ingestao_sem_linhas_faltando():
+    df = _bruto(np.arange(50) * 5.0, np.linspace(-20, -10, 50), [0] * 50)
+    grade = to_grid(df)
+    assert len(grade) == 50
+    assert gap_index(grade).empty
+    pd.testing.assert_frame_equal(fill_gaps(grade), grade)
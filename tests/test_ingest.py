@@ -0,0 +1,63 @@
+# Cache Parquet: gravado por várias sessões ao mesmo tempo (threads do mesmo
+# processo) sem leitura pela metade, e um cache por arquivo original mesmo com
+# CSV e planilha de mesmo nome na pasta.
+import threading
+import openpyxl
+import pandas as pd
+import pytest
+from bench.synthetic import chamber_frame, write_csv
+from sdr import ingest
+from sdr.live import LiveSeries
+
+
+def test_gravacoes_simultaneas(tmp_path):
+    caminho = str(tmp_path / "L1.csv")
+    write_csv(chamber_frame("2025-01-01", 3, 0), caminho)
+    df, _ = ingest.read_source(caminho)
+    destino = ingest.cache_path(caminho)
+    erros = []
+
+    def gravar():
+        for _ in range(10):
+            try:
+                ingest._gravar_cache(df, caminho, destino)
+                pd.testing.assert_frame_equal(pd.read_parquet(destino), df)
+            except Exception as e:
+                erros.append(e)
+
+    threads = [threading.Thread(target=gravar) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert erros == []
+    assert ingest._cache_valido(caminho, destino)
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def _planilha(caminho: str) -> None:
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.append(["Data/Hora", "Temp ambiente", "Potência (kW)"])
+    for i, instante in enumerate(pd.date_range("2025-01-01", periods=12, freq="5min")):
+        ws.append([instante.to_pydatetime(), -20.0 + i / 10, 5.0])
+    wb.save(caminho)
+
+
+def test_csv_e_planilha_de_mesmo_nome(tmp_path):
+    csv, xlsx = str(tmp_path / "L1.csv"), str(tmp_path / "L1.xlsx")
+    write_csv(chamber_frame("2025-01-01", 1, 0), csv)
+    _planilha(xlsx)
+    assert ingest.cache_path(csv) != ingest.cache_path(xlsx)
+    do_csv, da_planilha = ingest.load_file(csv), ingest.load_file(xlsx)
+    assert "kWh" in da_planilha.columns and "kWh" not in do_csv.columns
+    assert ingest._cache_valido(csv, ingest.cache_path(csv))
+    assert ingest._cache_valido(xlsx, ingest.cache_path(xlsx))
+    pd.testing.assert_frame_equal(ingest.load_file(csv), do_csv)
+
+
+def test_planilha_sem_modo_ao_vivo(tmp_path):
+    xlsx = str(tmp_path / "L1.xlsx")
+    _planilha(xlsx)
+    with pytest.raises(ValueError, match="modo ao vivo"):
+        LiveSeries(xlsx).update()
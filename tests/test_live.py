@@ -0,0 +1,79 @@
+# Modo ao vivo: derivados atualizados por incremento iguais aos recalculados
+# do zero, com linhas chegando em blocos de tamanhos variados.
+import numpy as np
+import pandas as pd
+from bench.synthetic import chamber_frame, write_csv
+from sdr.live import LiveSeries, _derivar, live_store_data
+from sdr.performance import RECOVERY_WINDOW
+from sdr.schedule import HORARIO_PADRAO
+from sdr.store import build_store
+
+
+def _comparar(a: dict, b: dict) -> None:
+    pd.testing.assert_frame_equal(a["eventos"].reset_index(drop=True), b["eventos"].reset_index(drop=True))
+    pd.testing.assert_frame_equal(a["rollup"], b["rollup"])
+    pd.testing.assert_frame_equal(a["lacunas"].reset_index(drop=True), b["lacunas"].reset_index(drop=True))
+    for nivel in b["piramide"]:
+        pd.testing.assert_frame_equal(a["piramide"][nivel], b["piramide"][nivel])
+
+
+def test_incremental_igual_ao_recalculo(tmp_path):
+    df = chamber_frame("2025-01-01", 8, 3)
+    df.iloc[-400:-390] = pd.NA              # falha longa
+    df.iloc[-200:-198] = pd.NA              # falha curta (preenchida)
+    df = df.drop(df.index[-900:-600])       # um dia sem nenhuma linha
+    completo = tmp_path / "completo.csv"
+    write_csv(df, str(completo))
+    linhas = completo.read_text(encoding="utf-8").splitlines(keepends=True)
+
+    caminho = tmp_path / "L1.csv"
+    inicio = len(linhas) - 1000
+    caminho.write_text("".join(linhas[:inicio]), encoding="utf-8")
+    live = LiveSeries(str(caminho))
+    live.update()
+    live.derived()
+
+    rng = np.random.default_rng(0)
+    pos = inicio
+    while pos < len(linhas):
+        k = int(rng.choice([1, 3, 40, 300]))
+        with open(caminho, "a", encoding="utf-8") as f:
+            f.writelines(linhas[pos:pos + k])
+        pos += k
+        live.update()
+        _comparar(live.derived(), _derivar(live.series(), HORARIO_PADRAO, RECOVERY_WINDOW))
+
+    # Mesma loja que build_store recalculando tudo sobre a carga completa
+    referencia = LiveSeries(str(caminho))
+    referencia.update()
+    pd.testing.assert_frame_equal(live.df, referencia.df)
+    dados, velho = live_store_data({"c": live}), build_store({"c": referencia.df})
+    _comparar({"eventos": dados.eventos["c"], "rollup": dados.rollups["c"], "lacunas": dados.lacunas["c"],
+               "piramide": dados.piramides["c"]},
+              {"eventos": velho.eventos["c"], "rollup": velho.rollups["c"], "lacunas": velho.lacunas["c"],
+               "piramide": velho.piramides["c"]})
+    assert dados.periodo == velho.periodo
+
+
+def test_falha_longa_dentro_de_degelo_no_corte(tmp_path):
+    # Degelo com falha de mais de um dia: o corte do incremento cai dentro da
+    # falha e o degelo continua depois dela (um evento só, como no recálculo)
+    df = chamber_frame("2025-01-01", 6, 5)
+    df.iloc[:, df.columns.get_loc("Degelo")] = 0
+    df.iloc[700:1200, df.columns.get_loc("Degelo")] = 1
+    df.iloc[705:1190] = pd.NA
+    completo = tmp_path / "completo.csv"
+    write_csv(df, str(completo))
+    linhas = completo.read_text(encoding="utf-8").splitlines(keepends=True)
+
+    caminho = tmp_path / "L1.csv"
+    caminho.write_text("".join(linhas[:1 + 704]), encoding="utf-8")
+    live = LiveSeries(str(caminho))
+    live.update()
+    live.derived()
+    for fim in (1 + 1195, 1 + 1300, len(linhas)):
+        with open(caminho, "a", encoding="utf-8") as f:
+            f.writelines(linhas[len(caminho.read_text(encoding="utf-8").splitlines()):fim])
+        live.update()
+        _comparar(live.derived(), _derivar(live.series(), HORARIO_PADRAO, RECOVERY_WINDOW))
+    assert len(live.derived()["eventos"]) == 1
@@ -0,0 +1,108 @@
+# recovery_mask (vetorizada) contra o laço original, em casos aleatórios:
+# instantes fora de ordem e repetidos, degelos fora do período dos dados e
+# janelas diferentes da padrão. performance_table (faixas do histograma do
+# rollup) contra a contagem direta das amostras, para tolerâncias que não são
+# múltiplas de 0,1 K.
+from datetime import timedelta
+import numpy as np
+import pandas as pd
+import pytest
+from sdr.performance import PERIODOS, RECOVERY_END, RECOVERY_START, SETPOINT, performance_table, recovery_mask
+from sdr.rollup import daily_rollup
+from sdr.schedule import period_codes
+
+INICIO = pd.Timestamp("2025-08-01")
+
+
+def recovery_mask_loop(index: pd.DatetimeIndex, events, start: timedelta = RECOVERY_START,
+                       end: timedelta = RECOVERY_END) -> np.ndarray:
+    # Implementação original: um par de comparações por evento
+    recovery = np.zeros(len(index), dtype=bool)
+    for t0 in events:
+        recovery |= (index > t0 + start) & (index <= t0 + end)
+    return recovery
+
+
+def _instantes(rng, n: int, ordenados: bool, repetidos: bool) -> pd.DatetimeIndex:
+    minutos = np.arange(n) * 5 + rng.integers(-2, 3, n)
+    if repetidos:
+        minutos[rng.choice(n, n // 10, replace=False)] = minutos[rng.choice(n, n // 10)]
+    if ordenados:
+        minutos = np.sort(minutos)
+    else:
+        rng.shuffle(minutos)
+    return pd.DatetimeIndex(INICIO + pd.to_timedelta(minutos, unit="min"))
+
+
+def _degelos(rng, n: int, dados_min: int) -> pd.Series:
+    # Parte dos degelos antes do primeiro e depois do último instante
+    minutos = rng.integers(-600, dados_min + 600, n)
+    return pd.Series(INICIO + pd.to_timedelta(np.sort(minutos), unit="min"))
+
+
+@pytest.mark.parametrize("seed", range(300))
+def test_recovery_mask_igual_ao_laco(seed):
+    rng = np.random.default_rng(seed)
+    n = int(rng.integers(1, 2000))
+    index = _instantes(rng, n, ordenados=bool(rng.integers(2)), repetidos=bool(rng.integers(2)))
+    eventos = _degelos(rng, int(rng.integers(0, 40)), n * 5)
+    if seed % 3:
+        start = timedelta(minutes=int(rng.integers(0, 120)))
+        end = start + timedelta(minutes=int(rng.integers(0, 120)))
+    else:
+        start, end = RECOVERY_START, RECOVERY_END
+    np.testing.assert_array_equal(recovery_mask(index, eventos, start, end),
+                                  recovery_mask_loop(index, eventos, start, end))
+
+
+def test_recovery_mask_limites():
+    # Janela (t0+45min, t0+75min]: exclui o início e inclui o fim
+    index = pd.DatetimeIndex(INICIO + pd.to_timedelta([44, 45, 46, 75, 76], unit="min"))
+    mascara = recovery_mask(index, [INICIO])
+    assert mascara.tolist() == [False, False, True, True, False]
+
+
+def test_recovery_mask_vazia():
+    index = pd.DatetimeIndex(INICIO + pd.to_timedelta([0, 5, 10], unit="min"))
+    assert not recovery_mask(index, []).any()
+    assert recovery_mask(pd.DatetimeIndex([]), [INICIO]).shape == (0,)
+
+
+def _amostras(temp, inicio: pd.Timestamp = INICIO) -> pd.DataFrame:
+    # Uma amostra a cada 5 min, sem degelos (INICIO é uma sexta-feira)
+    n = len(temp)
+    return pd.DataFrame({
+        "DataHora": inicio + pd.to_timedelta(np.arange(n) * 5, unit="min"),
+        "Temp ambiente": np.asarray(temp, dtype="float32"),
+        "Degelo": pd.array(np.zeros(n, dtype=np.int8), dtype="Int8"),
+    })
+
+
+def _performance(df: pd.DataFrame, delta: float) -> list:
+    # Contagem direta: desvio lido (0,1 K de resolução) <= delta
+    periodo = period_codes(pd.DatetimeIndex(df["DataHora"]))
+    desvio = np.round(np.abs(df["Temp ambiente"].to_numpy("float64") - SETPOINT), 1)
+    return [round(float((desvio[periodo == k] <= delta + 1e-9).mean() * 100), 1) if (periodo == k).any()
+            else "N/A" for k in range(len(PERIODOS))]
+
+
+@pytest.mark.parametrize("delta", [0.0, 0.3, 0.7, 1.0, 1.94, 1.96, 2.0, 2.05, 2.15, 3.05, 9.99, 12.0])
+def test_performance_faixa_arredonda_para_baixo(delta):
+    # Leituras de 0,0 a 3,0 K do setpoint, para cima e para baixo, de sexta a
+    # domingo (os três períodos)
+    rng = np.random.default_rng(int(delta * 100))
+    temp = SETPOINT + rng.choice([-1, 1], 864) * rng.integers(0, 31, 864) / 10
+    df = _amostras(temp)
+    rollup = daily_rollup(df)
+    dias = df["DataHora"].dt.normalize()
+    tabela = performance_table(rollup, dias.min(), dias.max(), delta)
+    assert tabela["Performance (%)"].tolist() == _performance(df, delta)
+
+
+def test_performance_tolerancia_entre_faixas():
+    # Desvios de 1,9, 2,0 e 2,1 K em horário de operação: com 1,96 K só o primeiro conta
+    df = _amostras([SETPOINT + 1.9, SETPOINT - 2.0, SETPOINT + 2.1] * 4, INICIO + pd.Timedelta(hours=10))
+    rollup = daily_rollup(df)
+    dia = df["DataHora"].iloc[0].normalize()
+    assert performance_table(rollup, dia, dia, 1.96)["Performance (%)"].iloc[0] == pytest.approx(33.3)
+    assert performance_table(rollup, dia, dia, 2.0)["Performance (%)"].iloc[0] == pytest.approx(66.7)
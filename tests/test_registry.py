@@ -0,0 +1,59 @@
+# Um loja.json inválido fica fora do cadastro sem derrubar as outras lojas; o
+# cadastro do dashboard só é relido quando algum loja.json muda.
+import json
+import os
+import lojas
+import sdr.registry
+from sdr.registry import load_registry
+from sdr.schedule import HORARIO_PADRAO
+
+CAMARA = {"nome": "Cam Cong L1", "arquivo": "L1.csv", "potencia_kw": 16.05}
+
+
+def _loja(data_dir, pasta: str, conteudo) -> str:
+    (data_dir / pasta).mkdir()
+    caminho = data_dir / pasta / "loja.json"
+    caminho.write_text(conteudo if isinstance(conteudo, str) else json.dumps(conteudo), encoding="utf-8")
+    return str(caminho)
+
+
+def test_cadastro_invalido_nao_derruba_as_outras(tmp_path):
+    _loja(tmp_path, "boa", {"nome": "Loja Boa", "camaras": [CAMARA]})
+    ruins = [
+        _loja(tmp_path, "json", '{"nome": "Quebrada", '),
+        _loja(tmp_path, "potencia", {"nome": "Sem potência", "camaras": [{"nome": "A", "arquivo": "a.csv"}]}),
+        _loja(tmp_path, "horario", {"nome": "Horário", "horario": {"abertura": "25:00"}, "camaras": [CAMARA]}),
+        _loja(tmp_path, "vazia", {"nome": "Sem câmaras"}),
+    ]
+    lojas, erros = load_registry(str(tmp_path))
+    assert list(lojas) == ["Loja Boa"]
+    assert lojas["Loja Boa"]["potencias"] == {"Cam Cong L1": 16.05}
+    assert lojas["Loja Boa"]["horario"] == HORARIO_PADRAO
+    assert sorted(erros) == sorted(ruins)
+    assert all(isinstance(e, ValueError) for e in erros.values())
+
+
+def test_cadastro_relido_so_quando_muda(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "data").mkdir()
+    caminho = _loja(tmp_path / "data", "boa", {"nome": "Loja Boa", "camaras": [CAMARA]})
+    leituras = []
+    original = sdr.registry._ler_config
+
+    def ler(c):
+        leituras.append(c)
+        return original(c)
+
+    monkeypatch.setattr(sdr.registry, "_ler_config", ler)
+    monkeypatch.setattr(lojas, "_CADASTRO", (None, None))
+    for _ in range(3):
+        assert lojas.lojas_disponiveis() == ["Loja Boa"]
+        assert lojas.horario_loja("Loja Boa") == HORARIO_PADRAO
+    assert len(leituras) == 1
+
+    with open(caminho, "w", encoding="utf-8") as f:
+        json.dump({"nome": "Loja Nova", "camaras": [CAMARA]}, f)
+    os.utime(caminho, ns=(1, 1))
+    assert lojas.lojas_disponiveis() == ["Loja Nova"]
+    assert lojas.lojas_selecionadas("Loja Boa") == ({}, {})
+    assert len(leituras) == 2
@@ -0,0 +1,22 @@
+# Relatórios estáticos: índice truncado (outra sessão gravando) conta como
+# relatório velho e é refeito, sem JSONDecodeError.
+import json
+from bench.synthetic import chamber_frame, write_csv
+from sdr.schedule import HORARIO_PADRAO
+from sdr.snapshot import ensure_snapshots
+
+
+def test_indice_truncado_refaz(tmp_path):
+    caminho = str(tmp_path / "L1.csv")
+    write_csv(chamber_frame("2025-01-01", 10, 0), caminho)
+    cadastro = {"nome": "Loja Teste", "pasta": str(tmp_path), "arquivos": {"Cam L1": caminho},
+                "potencias": {"Cam L1": 10.0}, "horario": HORARIO_PADRAO}
+    caminhos = ensure_snapshots(cadastro)
+    indice = tmp_path / "snapshots" / "index.json"
+    completo = indice.read_text(encoding="utf-8")
+    indice.write_text(completo[:len(completo) // 2], encoding="utf-8")
+
+    assert ensure_snapshots(cadastro) == caminhos
+    assert indice.read_text(encoding="utf-8") == completo
+    assert json.loads(completo)["periodos"].keys() == caminhos.keys()
+    assert not [p for p in (tmp_path / "snapshots").iterdir() if p.suffix == ".tmp"]
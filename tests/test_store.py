@@ -0,0 +1,49 @@
+# Loja montada por load_store: câmara com uma parte ilegível sai da loja com
+# o erro, e a loja incompleta não fica no cache.
+import pytest
+import sdr.store
+from bench.synthetic import chamber_frame, write_csv
+from sdr.memcache import FileCache
+from sdr.store import load_store
+
+
+@pytest.fixture
+def arquivos(tmp_path):
+    paths = {}
+    for i, nome in enumerate(["L1", "L2"]):
+        caminho = str(tmp_path / f"{nome}.csv")
+        write_csv(chamber_frame("2025-01-01", 3, i), caminho)
+        paths[nome] = caminho
+    return paths
+
+
+@pytest.mark.parametrize("parte", ["load_events", "load_rollup", "load_gaps"])
+def test_parte_ilegivel_tira_a_camara(arquivos, monkeypatch, parte):
+    original = getattr(sdr.store, parte)
+
+    def quebrado(caminho, *args, **kwargs):
+        if caminho == arquivos["L2"]:
+            raise OSError("ilegível")
+        return original(caminho, *args, **kwargs)
+
+    monkeypatch.setattr(sdr.store, parte, quebrado)
+    cache = FileCache()
+    dados, erros = load_store(arquivos, cache)
+    assert list(erros) == ["L2"]
+    for componente in (dados.partes, dados.rollups, dados.eventos, dados.lacunas):
+        assert list(componente) == ["L1"]
+
+    monkeypatch.setattr(sdr.store, parte, original)
+    dados, erros = load_store(arquivos, cache)
+    assert erros == {}
+    assert list(dados.partes) == list(dados.rollups) == ["L1", "L2"]
+
+
+def test_sem_camaras_validas(arquivos, monkeypatch):
+    def quebrado(caminho, *args, **kwargs):
+        raise ValueError("ilegível")
+
+    monkeypatch.setattr(sdr.store, "load_rollup", quebrado)
+    dados, erros = load_store(arquivos, FileCache())
+    assert dados is None
+    assert sorted(erros) == ["L1", "L2"]
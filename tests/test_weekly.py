@@ -0,0 +1,113 @@
+# Exports semanais: merge_sorted contra concatenar + ordenar + descartar
+# repetidos, e a série montada por stitch_chamber reaproveitada pelo
+# manifesto (só as semanas novas são lidas) igual à montagem do zero.
+import json
+import os
+import numpy as np
+import pandas as pd
+import pytest
+import sdr.weekly
+from bench.synthetic import chamber_frame, write_csv
+from sdr.parser import ENCODING
+from sdr.weekly import MANIFEST_SUFFIX, merge_sorted, stitch_chamber
+
+
+def _serie(rng, inicio: int, n: int) -> pd.DataFrame:
+    # Instantes (minutos) ordenados e sem repetição, a partir de `inicio`
+    minutos = inicio + np.sort(rng.choice(n * 3, n, replace=False)) * 5
+    return pd.DataFrame({
+        "DataHora": pd.Timestamp("2025-08-01") + pd.to_timedelta(minutos, unit="min"),
+        "Temp ambiente": rng.normal(-20, 1, n).astype("float32"),
+    })
+
+
+def merge_loop(base: pd.DataFrame, novo: pd.DataFrame) -> pd.DataFrame:
+    juntas = pd.concat([base, novo], ignore_index=True).sort_values("DataHora", kind="stable")
+    return juntas[~juntas["DataHora"].duplicated(keep="last")].reset_index(drop=True)
+
+
+@pytest.mark.parametrize("seed", range(100))
+def test_merge_sorted_igual_a_concatenar(seed):
+    rng = np.random.default_rng(seed)
+    base = _serie(rng, 0, int(rng.integers(1, 200)))
+    # Antes, dentro, depois ou cobrindo a base inteira
+    inicio = int(rng.integers(-1500, 3500)) // 5 * 5
+    novo = _serie(rng, inicio, int(rng.integers(1, 200)))
+    pd.testing.assert_frame_equal(merge_sorted(base, novo), merge_loop(base, novo))
+
+
+def test_merge_sorted_vazios():
+    rng = np.random.default_rng(0)
+    base = _serie(rng, 0, 10)
+    assert merge_sorted(None, base) is base
+    assert merge_sorted(base, base.iloc[:0]) is base
+
+
+@pytest.fixture
+def semanas(tmp_path):
+    # Três semanas de uma câmara, cada uma sobrepondo um dia da anterior com
+    # valores diferentes (vale a exportação mais nova)
+    completo = chamber_frame("2025-08-04", 22, 0).reset_index().rename(columns={"Data": "DataHora"})
+    caminhos = []
+    for i in range(3):
+        inicio = pd.Timestamp("2025-08-04") + pd.Timedelta(days=7 * i - (1 if i else 0))
+        semana = completo[(completo["DataHora"] >= inicio) & (completo["DataHora"] < inicio + pd.Timedelta(days=8))].copy()
+        semana["Temp ambiente"] += i
+        caminho = str(tmp_path / f"L1A01_semana{i}.csv")
+        write_csv(semana, caminho)
+        caminhos.append(caminho)
+    return caminhos
+
+
+def _do_zero(caminhos: list) -> pd.DataFrame:
+    base = None
+    for caminho in caminhos:
+        base = merge_sorted(base, sdr.weekly.read_weekly(caminho)[1])
+    return base
+
+
+def test_stitch_incremental(tmp_path, semanas, monkeypatch):
+    lidos = []
+    original = sdr.weekly.read_weekly
+
+    def read_weekly(caminho):
+        lidos.append(os.path.basename(caminho))
+        return original(caminho)
+
+    monkeypatch.setattr(sdr.weekly, "read_weekly", read_weekly)
+    pasta = str(tmp_path)
+
+    df, manifesto = stitch_chamber(pasta, "L1", semanas[:2])
+    assert sorted(lidos) == ["L1A01_semana0.csv", "L1A01_semana1.csv"]
+    assert list(manifesto["arquivos"]) == ["L1A01_semana0.csv", "L1A01_semana1.csv"]
+
+    # Semana nova: só ela é lida, e o resultado é a montagem do zero
+    lidos.clear()
+    df, manifesto = stitch_chamber(pasta, "L1", semanas)
+    assert lidos == ["L1A01_semana2.csv"]
+    pd.testing.assert_frame_equal(df, _do_zero(semanas))
+    assert not df["DataHora"].duplicated().any()
+    dia = df[df["DataHora"].dt.normalize() == pd.Timestamp("2025-08-10")]
+    anterior = _do_zero(semanas[:1]).set_index("DataHora").loc[dia["DataHora"], "Temp ambiente"]
+    assert len(dia) and np.allclose(dia["Temp ambiente"] - 1, anterior, equal_nan=True)
+
+    # Nada mudou: nada é lido; semana já mesclada alterada: remonta tudo
+    lidos.clear()
+    pd.testing.assert_frame_equal(stitch_chamber(pasta, "L1", semanas)[0], df)
+    assert lidos == []
+    with open(semanas[0], "a", encoding=ENCODING) as f:
+        f.write("2025-08-31 00:00:00.0;-21,0;1;0;-30,0;9,0;-21,0;;\n")
+    df, manifesto = stitch_chamber(pasta, "L1", semanas)
+    assert sorted(lidos) == ["L1A01_semana0.csv", "L1A01_semana1.csv", "L1A01_semana2.csv"]
+    assert df["DataHora"].iloc[-1] == pd.Timestamp("2025-08-31")
+
+
+def test_manifesto_ilegivel_remonta(tmp_path, semanas):
+    pasta = str(tmp_path)
+    df, _ = stitch_chamber(pasta, "L1", semanas)
+    with open(os.path.join(pasta, "L1" + MANIFEST_SUFFIX), "w", encoding="utf-8") as f:
+        f.write('{"versao": ')
+    novo, manifesto = stitch_chamber(pasta, "L1", semanas)
+    pd.testing.assert_frame_equal(novo, df)
+    with open(os.path.join(pasta, "L1" + MANIFEST_SUFFIX), encoding="utf-8") as f:
+        assert json.load(f) == manifesto